@@ -0,0 +1,167 @@
+#!/usr/bin/python3
+""" agent.py - get the data of the miners from another host
+    v0.0.5 - 2026-10-19 - nelbren@nelbren.com
+
+    The agent keeps running and speaks JSON lines over stdio:
+    -> {"id": 1, "source": "cryptoatcost"}
+    <- {"id": 1, "value": "0.00012345", "usd": "4.56", "price": null}
+       (exact texts, the price of the panels with a price call)
+    <- {"id": 1, "error": "MaintenanceMode", "message": ""}
+    <- {"id": 1, "error": "UnknownSource", "message": "bitmain"}"""
+import os
+import sys
+import json
+import atexit
+import select
+import tempfile
+import subprocess
+from mining.resilience import UpstreamError
+from units import to_decimal
+
+PWD = os.path.dirname(os.path.realpath(__file__))
+PWD_DIR = os.path.basename(PWD)
+AGENTS = {}  # Running agents, by host
+TIMEOUT = 120  # Seconds to wait for an answer (a login with retries)
+
+
+class AgentError(UpstreamError):
+    """Raised when the agent fails or can't get the data"""
+
+
+def get_command(hostname=None):
+    """Command to run the agent, over ssh (multiplexed) or locally"""
+    command = [f"{PWD}/agent.py"]
+    if not hostname:
+        return [sys.executable] + command
+    control = f"{tempfile.gettempdir()}/.{PWD_DIR}-ssh-%r@%h:%p"
+    return [
+        "ssh",
+        "-o",
+        "ControlMaster=auto",
+        "-o",
+        f"ControlPath={control}",
+        "-o",
+        "ControlPersist=10m",
+        hostname,
+    ] + command
+
+
+class Agent:
+    """Client of a running agent"""
+
+    def __init__(self, command):
+        self.command = command
+        self.process = None
+        self.requests = 0
+
+    def start(self):
+        """Run the agent"""
+        self.process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+        )
+
+    def close(self):
+        """Stop the agent"""
+        if self.process and self.process.poll() is None:
+            self.process.stdin.close()
+            self.process.wait()
+        self.process = None
+
+    def kill(self, message):
+        """Stop the agent that doesn't answer well (a late answer would be
+        read by the next request) and raise"""
+        self.process.kill()
+        self.process.wait()
+        self.process = None
+        raise AgentError(f"agent: {message} from {self.command}")
+
+    def call(self, source):
+        """Send the request and wait for the answer"""
+        if self.process is None or self.process.poll() is not None:
+            self.start()
+        self.requests += 1
+        request = {"id": self.requests, "source": source}
+        try:
+            self.process.stdin.write(json.dumps(request) + "\n")
+            self.process.stdin.flush()
+            ready, _, _ = select.select([self.process.stdout], [], [], TIMEOUT)
+            line = self.process.stdout.readline() if ready else None
+        except (BrokenPipeError, OSError) as exception:
+            self.close()
+            raise AgentError(f"agent: {exception}") from exception
+        if line is None:
+            self.kill(f"no answer in {TIMEOUT}s")
+        if not line:
+            self.close()
+            raise AgentError(f"agent: no answer from {self.command}")
+        try:
+            answer = json.loads(line)
+        except ValueError:
+            self.kill(f"invalid answer {line!r}")
+        if answer.get("id") != request["id"]:
+            self.kill(f"answer {answer.get('id')} to {request['id']}")
+        return answer
+
+    def wallet(self, source):
+        """Get the data of the source (value, usd, price)"""
+        answer = self.call(source)
+        if "error" in answer:
+            if answer["error"] == "MaintenanceMode":
+                # pylint: disable=import-outside-toplevel
+                from mining.cryptoatcost import MaintenanceMode
+
+                raise MaintenanceMode
+            raise AgentError(
+                f"{source}: {answer['error']} {answer['message']}"
+            )
+        price = answer.get("price")  # Older agents don't send it
+        return (
+            to_decimal(answer["value"]),
+            to_decimal(answer["usd"]),
+            to_decimal(price) if price is not None else None,
+        )
+
+
+def get_agent(hostname=None):
+    """Agent of the host, started once"""
+    if hostname not in AGENTS:
+        AGENTS[hostname] = Agent(get_command(hostname))
+    return AGENTS[hostname]
+
+
+@atexit.register
+def close_agents():
+    """Stop the agents"""
+    for agent in AGENTS.values():
+        agent.close()
+
+
+def serve():
+    """Answer the requests, the panels stay logged between them"""
+    # pylint: disable=import-outside-toplevel
+    sys.path.insert(0, PWD)
+    from fetch import get_data_local
+
+    channel = sys.stdout
+    sys.stdout = sys.stderr  # The panels print messages
+    for line in sys.stdin:
+        request = json.loads(line)
+        answer = {"id": request["id"]}
+        try:
+            value, usd, price = get_data_local(request["source"])
+            answer["value"], answer["usd"] = str(value), str(usd)
+            answer["price"] = str(price) if price is not None else None
+        # pylint: disable=broad-except
+        except (Exception, SystemExit) as exception:
+            answer["error"] = type(exception).__name__
+            answer["message"] = str(exception)
+        channel.write(json.dumps(answer) + "\n")
+        channel.flush()
+
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,203 @@
+#!/usr/bin/python3
+""" archive.py - move the old history of the database to parquet files
+    v0.0.3 - 2026-10-19 - nelbren@nelbren.com
+
+    The unpaids older than HOT_DAYS (with their deltas) go to a parquet
+    file by source and month (hive partitions), sqlite keeps the recent
+    window. The readers map the files in memory and only load the columns
+    and the rows asked (pyarrow is optional, without it nothing moves)."""
+import os
+from pathlib import Path
+from datetime import datetime, timedelta
+from peewee import JOIN
+from database import db, Unpaid, Delta
+import cadence
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    from pyarrow import fs
+except ImportError:
+    pa = None
+
+HOME = str(Path.home())
+PWD = os.path.dirname(os.path.realpath(__file__))
+PWD_DIR = os.path.basename(PWD)
+BASE = f"{HOME}/.{PWD_DIR}.archive"
+TS_FMT = "%Y-%m-%d %H:%M:%S"
+KEEP = cadence.SAMPLES + 1  # Rows always hot by source (the cadence)
+CHUNK = 500  # Ids by delete
+COLUMNS = [
+    # name, type (the source and the month are in the path)
+    ("id", "int64"),
+    ("currency", "string"),
+    ("work", "int32"),
+    ("step", "int32"),
+    ("timestamp", "string"),
+    ("value", "float64"),
+    ("usd", "float64"),
+    ("delta_value", "float64"),
+    ("delta_usd", "float64"),
+]
+
+
+class ArchiveError(Exception):
+    """Raised when the archive can't be written"""
+
+
+def get_cutoff(source, currency, hot_days, now):
+    """Timestamp of the oldest hot unpaid of the source"""
+    cutoff = (now - timedelta(days=hot_days)).strftime(TS_FMT)
+    kept = (
+        Unpaid.select(Unpaid.timestamp)
+        .where((Unpaid.source == source) & (Unpaid.currency == currency))
+        .order_by(Unpaid.timestamp.desc())
+        .offset(KEEP - 1)
+        .limit(1)
+        .scalar()
+    )
+    return min(cutoff, kept) if kept else None
+
+
+def get_cold(hot_days, now):
+    """Rows to archive by partition (source, month)"""
+    partitions = {}
+    groups = Unpaid.select(Unpaid.source, Unpaid.currency).distinct()
+    for source, currency in groups.tuples():
+        cutoff = get_cutoff(source, currency, hot_days, now)
+        if cutoff is None:
+            continue
+        rows = (
+            Unpaid.select(
+                Unpaid.id,
+                Unpaid.currency,
+                Unpaid.work,
+                Unpaid.step,
+                Unpaid.timestamp,
+                Unpaid.value,
+                Unpaid.usd,
+                Delta.value,
+                Delta.usd,
+            )
+            .join(Delta, JOIN.LEFT_OUTER, on=(Delta.unpaid == Unpaid.id))
+            .where(
+                (Unpaid.source == source)
+                & (Unpaid.currency == currency)
+                & (Unpaid.timestamp < cutoff)
+            )
+            .order_by(Unpaid.timestamp)
+            .tuples()
+        )
+        for row in rows:  # The amounts as floats, like the old files
+            amounts = tuple(
+                None if amount is None else float(amount)
+                for amount in row[5:]
+            )
+            partitions.setdefault((source, row[4][:7]), []).append(
+                row[:5] + amounts
+            )
+    return partitions
+
+
+def get_path(source, month):
+    """File of the partition"""
+    return f"{BASE}/source={source}/month={month}/data.parquet"
+
+
+def write_partition(source, month, rows):
+    """Add the rows to the file of the partition (without repeating ids
+    of an interrupted run)"""
+    schema = pa.schema([(name, kind) for name, kind in COLUMNS])
+    table = pa.Table.from_pylist(
+        [dict(zip([name for name, _ in COLUMNS], row)) for row in rows],
+        schema=schema,
+    )
+    path = get_path(source, month)
+    if os.path.exists(path):
+        old = pq.read_table(path, memory_map=True)
+        old = old.filter(pc.invert(pc.is_in(old["id"], table["id"])))
+        table = pa.concat_tables([old, table]).sort_by("timestamp")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    pq.write_table(table, path + ".tmp", compression="zstd")
+    os.replace(path + ".tmp", path)
+
+
+def delete_rows(ids):
+    """Delete the unpaids archived (and their deltas)"""
+    with db.atomic():
+        for item in range(0, len(ids), CHUNK):
+            chunk = ids[item : item + CHUNK]
+            Delta.delete().where(Delta.unpaid.in_(chunk)).execute()
+            Unpaid.delete().where(Unpaid.id.in_(chunk)).execute()
+
+
+def archive(hot_days, now=None):
+    """Move the unpaids older than hot_days to the archive, returns the
+    rows moved by partition"""
+    if pa is None:
+        raise ArchiveError("pyarrow is not installed (pip install pyarrow)")
+    now = now or datetime.now()
+    partitions = get_cold(hot_days, now)
+    for (source, month), rows in sorted(partitions.items()):
+        write_partition(source, month, rows)
+    delete_rows([row[0] for rows in partitions.values() for row in rows])
+    return {key: len(rows) for key, rows in partitions.items()}
+
+
+def read(columns=None, sources=None, begin=None, end=None, after=None):
+    """Archived unpaids (pyarrow table), only the columns and the rows
+    asked, None without archive. after ({source: timestamp}) skips the rows
+    of each source up to its timestamp (already read)"""
+    if pa is None or not os.path.isdir(BASE):
+        return None
+    dataset = ds.dataset(
+        BASE,
+        format="parquet",
+        partitioning="hive",
+        filesystem=fs.LocalFileSystem(use_mmap=True),
+    )
+    conditions = []
+    if sources:
+        conditions.append(ds.field("source").isin(sources))
+    if begin:
+        conditions.append(ds.field("month") >= begin[:7])
+        conditions.append(ds.field("timestamp") >= begin)
+    if end:
+        conditions.append(ds.field("month") <= end[:7])
+        conditions.append(ds.field("timestamp") < end)
+    if after:
+        newer = ~ds.field("source").isin(list(after))  # New sources, whole
+        for source, timestamp in after.items():
+            newer = newer | (
+                (ds.field("source") == source)
+                & (ds.field("month") >= timestamp[:7])
+                & (ds.field("timestamp") > timestamp)
+            )
+        conditions.append(newer)
+    condition = None
+    for item in conditions:
+        condition = item if condition is None else condition & item
+    return dataset.to_table(columns=columns, filter=condition)
+
+
+if __name__ == "__main__":
+    # pylint: disable=import-outside-toplevel
+    import argparse
+    from config import get_config
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--hot-days",
+        type=int,
+        default=get_config()["archive_hot_days"],
+        dest="hot_days",
+        help="Days kept in the database (HOT_DAYS of ARCHIVE)",
+    )
+    args = parser.parse_args()
+    if not args.hot_days:
+        parser.error("set HOT_DAYS in the ARCHIVE section or --hot-days")
+    db.connect()
+    for (_source, _month), _rows in sorted(archive(args.hot_days).items()):
+        print(f"{_source} {_month}: {_rows} rows archived")
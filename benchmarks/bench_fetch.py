@@ -0,0 +1,114 @@
+#!/usr/bin/python3
+""" bench_fetch.py - offline benchmark of the fetch of the miners
+    v0.0.1 - 2026-10-19 - nelbren@nelbren.com
+
+    The pools answer from the fixtures (mining/replay.py) with an injected
+    latency, sequential and concurrent refreshes of every source are
+    measured: cold (login) and warm latency, and requests by refresh."""
+import os
+import sys
+import time
+import tempfile
+import argparse
+from statistics import median, quantiles
+from concurrent.futures import ThreadPoolExecutor
+
+PWD = os.path.dirname(os.path.realpath(__file__))
+sys.path.insert(0, os.path.dirname(PWD))
+USERNAME = "bench"
+CFG = {
+    "hostname": None,
+    "username": USERNAME,
+    "password": "bench",
+    "code_2fa": None,
+    "address": "0x0000000000000000000000000000000000000001",
+    "nch_org": "bench-org",
+    "nch_key": "bench-key",
+    "nch_secret": "bench-secret",
+    "gateway_url": None,
+}
+
+
+def get_args():
+    """Get args"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument(
+        "--latency", type=float, default=50, help="Milliseconds by request"
+    )
+    return parser.parse_args()
+
+
+def setup(latency):
+    """Replay the fixtures, without the config and the rate limits"""
+    os.environ["MINER_REPLAY"] = f"{PWD}/fixtures"
+    os.environ["MINER_REPLAY_LATENCY"] = str(latency)
+    # pylint: disable=import-outside-toplevel
+    import config
+    from mining import resilience
+
+    config.get_config = lambda: CFG
+    resilience.RATE = resilience.CAPACITY = float("inf")
+
+
+def bench(name, refresh, rounds):
+    """Measure the refreshes"""
+    # pylint: disable=import-outside-toplevel
+    import fetch
+    from mining import replay
+
+    cookie = f"{tempfile.gettempdir()}/.wallet_cryptoatcost.cookie_{USERNAME}"
+    if os.path.exists(cookie):
+        os.remove(cookie)
+    fetch.PANELS.clear()
+    replay.COUNTS.clear()
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        refresh()
+        times.append((time.perf_counter() - start) * 1000)
+    warm = times[1:]
+    p95 = quantiles(warm, n=20)[-1] if len(warm) > 1 else warm[0]
+    requests = sum(replay.COUNTS.values()) / rounds
+    print(
+        f"{name:<11} {times[0]:9.1f} {median(warm):9.1f} {p95:9.1f} "
+        f"{requests:9.1f}"
+    )
+
+
+def main():
+    """Main"""
+    args = get_args()
+    setup(args.latency)
+    # pylint: disable=import-outside-toplevel
+    import fetch
+
+    params = {"hostname": None, "cfg": CFG}
+    sources = list(fetch.SOURCES)
+
+    def sequential():
+        for source in sources:
+            fetch.get_wallet_direct(params, source)
+
+    executor = ThreadPoolExecutor(len(sources))
+
+    def concurrent():
+        list(
+            executor.map(
+                lambda source: fetch.get_wallet_direct(params, source),
+                sources,
+            )
+        )
+
+    print(f"{args.rounds} refreshes, {args.latency:g} ms by request")
+    print(
+        f"{'mode':<11} {'cold ms':>9} {'warm ms':>9} {'p95 ms':>9} "
+        f"{'requests':>9}"
+    )
+    bench("sequential", sequential, args.rounds)
+    bench("concurrent", concurrent, args.rounds)
+    executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
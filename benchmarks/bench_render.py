@@ -0,0 +1,234 @@
+#!/usr/bin/python3
+""" bench_render.py - how the render and query paths scale with history
+    v0.0.3 - 2026-10-19 - nelbren@nelbren.com
+
+    For each size a temporary database is filled (synthetic.py), then
+    every path is timed (rows of history by second) and measured again
+    with tracemalloc (peak memory). The results are compared with the
+    baselines (--save to write them) and the regressions are flagged."""
+import os
+import sys
+import json
+import shutil
+import time
+import tempfile
+import argparse
+import tracemalloc
+from io import StringIO
+
+PWD = os.path.dirname(os.path.realpath(__file__))
+sys.path.insert(0, os.path.dirname(PWD))
+BASELINES = f"{PWD}/baselines/render.json"
+SIZE_TERM = {"columns": 100, "lines": 50}
+CFG = {
+    "hostname": None,
+    "cac_goal_usd": None,
+    "cac_goal_btc": None,
+    "etm_goal_usd": None,
+    "etm_goal_btc": None,
+    "nch_goal_usd": None,
+    "nch_goal_btc": None,
+    "gateway_url": None,
+}
+
+
+def get_args():
+    """Get args"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes",
+        default="1000,100000",
+        help="Rows of history, comma separated (1M: 1000000)",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.5,
+        help="Slower or bigger than the baseline by this is a regression",
+    )
+    parser.add_argument("--save", action="store_true", help="Save baselines")
+    parser.add_argument(
+        "--check", action="store_true", help="Exit 1 on regressions"
+    )
+    return parser.parse_args()
+
+
+def setup():
+    """Temporary home (database) and config"""
+    home = tempfile.mkdtemp(prefix="bench_render_")
+    os.environ["HOME"] = home
+    # pylint: disable=import-outside-toplevel
+    import config
+
+    config.get_config = lambda: CFG
+    return home
+
+
+def get_params(records):
+    """Params of preview.py"""
+    return {
+        "cfg": CFG,
+        "name": "bench",
+        "ethermine": True,
+        "cryptoatcost": True,
+        "nicehash": True,
+        "hostname": None,
+        "daemon": True,
+        "records": records,
+        "columns": SIZE_TERM["columns"],
+        "chart": "7d",
+        "buckets": 42,
+        "save_dir": "",
+        "mail": False,
+        "telegram": False,
+    }
+
+
+def get_paths(size):
+    """Render and query paths (name, function, repeatable)"""
+    # pylint: disable=import-outside-toplevel
+    import view
+    import chart_text
+    import synthetic
+    from deltas_and_tags import backfill_deltas
+    from rollup import backfill_rollups
+    from stats import backfill_stats
+    from table import make_table
+    from render_session import RenderSession
+
+    def show_data():
+        session = RenderSession(SIZE_TERM, file=StringIO())
+        session.new_console()
+        view.show_data(session, get_params(-1), {}, SIZE_TERM)
+
+    def iterate_all():
+        params = get_params(0)
+        params["records_cryptoatcost"] = 0
+        data = {"lines_show": 0, "last_unpaid": None}
+        table = make_table()
+        view.iterate_on_records("cryptoatcost", "btc", table, params, data)
+
+    def show_big():
+        session = RenderSession(SIZE_TERM, file=StringIO())
+        view.show_big(get_params(-1), SIZE_TERM, session.new_console())
+
+    def show_chart(window):
+        chart_text.CACHE.clear()
+        chart_text.show_chart("cryptoatcost", "btc", SIZE_TERM, window, 42)
+
+    paths = [
+        ("insert", lambda: synthetic.generate(size), False),
+        ("backfill_deltas", backfill_deltas, False),
+        ("backfill_rollups", backfill_rollups, False),
+        ("backfill_stats", backfill_stats, False),
+        ("show_data", show_data, True),
+        ("iterate_all", iterate_all, True),
+        ("show_big", show_big, True),
+        ("show_chart_7d", lambda: show_chart("7d"), True),
+        ("show_chart_all", lambda: show_chart("all"), True),
+    ]
+    try:
+        import graph
+    except ImportError:
+        print("graph.update_table: skipped (dash is not installed)")
+    else:
+        import sqlite3
+
+        graph.conn = sqlite3.connect(
+            f"{os.environ['HOME']}/{size}.db", check_same_thread=False
+        )
+        paths.append(
+            (
+                "graph_update_table",
+                lambda: graph.update_table(0, 23, [], ""),
+                True,
+            )
+        )
+    return paths
+
+
+def measure(size, paths):
+    """Time of each path and its peak of memory"""
+    results = {}
+    for name, function, repeatable in paths:
+        start = time.perf_counter()
+        function()
+        seconds = time.perf_counter() - start
+        peak = None
+        if repeatable:
+            tracemalloc.start()
+            function()
+            peak = tracemalloc.get_traced_memory()[1] / 1024
+            tracemalloc.stop()
+        results[name] = {
+            "ms": round(seconds * 1000, 1),
+            "rows_s": round(size / seconds),
+            "peak_kib": round(peak) if peak is not None else None,
+        }
+    return results
+
+
+def is_worse(value, base, tolerance):
+    """Bigger than the baseline, beyond the tolerance"""
+    return value is not None and base and value > base * (1 + tolerance)
+
+
+def report(size, results, baselines, tolerance):
+    """Show the results of a size, returns the regressions"""
+    regressions = 0
+    base = baselines.get(str(size), {})
+    print(f"\n{size} rows")
+    print(
+        f"{'path':<20} {'ms':>10} {'rows/s':>12} {'peak KiB':>10} "
+        f"{'base ms':>10}"
+    )
+    for name, result in results.items():
+        old = base.get(name, {})
+        flag = ""
+        if is_worse(result["ms"], old.get("ms"), tolerance) or is_worse(
+            result["peak_kib"], old.get("peak_kib"), tolerance
+        ):
+            flag = " REGRESSION"
+            regressions += 1
+        peak = result["peak_kib"] if result["peak_kib"] is not None else "-"
+        print(
+            f"{name:<20} {result['ms']:>10.1f} {result['rows_s']:>12} "
+            f"{peak:>10} {old.get('ms', '-'):>10}{flag}"
+        )
+    return regressions
+
+
+def main():
+    """Main"""
+    args = get_args()
+    home = setup()
+    # pylint: disable=import-outside-toplevel
+    from database import db, Unpaid, Delta, Rollup, Stat, Price
+
+    baselines = {}
+    if os.path.exists(BASELINES):
+        with open(BASELINES, encoding="utf-8") as _file:
+            baselines = json.load(_file)
+    regressions = 0
+    for size in [int(size) for size in args.sizes.split(",")]:
+        db.init(f"{home}/{size}.db")
+        db.connect()
+        db.create_tables([Unpaid, Delta, Rollup, Stat, Price])
+        results = measure(size, get_paths(size))
+        db.close()
+        regressions += report(size, results, baselines, args.tolerance)
+        if args.save:
+            baselines[str(size)] = results
+    if args.save:
+        os.makedirs(os.path.dirname(BASELINES), exist_ok=True)
+        with open(BASELINES, "w", encoding="utf-8") as _file:
+            json.dump(baselines, _file, indent=2)
+            _file.write("\n")
+    shutil.rmtree(home)
+    print(f"\n{regressions} regressions")
+    if args.check and regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/python3
+""" bench_startup.py - import-time budget of the light modes of preview.py
+    v0.0.1 - 2026-10-19 - nelbren@nelbren.com
+
+    Each mode runs in a new process (offline, the fixtures of
+    mining/replay.py and a temporary database), the heavy modules it must
+    not import are checked in sys.modules and its time with the budget.
+    Exit 1 when a mode loads a heavy module or takes longer."""
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import argparse
+import subprocess
+
+PWD = os.path.dirname(os.path.realpath(__file__))
+PREVIEW = f"{os.path.dirname(PWD)}/preview.py"
+SECRET = """[CRYPTOATCOST]
+USERNAME = bench
+PASSWORD = bench
+[ETHERMINE]
+ADDRESS = 0x0000000000000000000000000000000000000001
+[NICEHASH]
+ORG = bench-org
+KEY = bench-key
+SECRET = bench-secret
+"""
+HEAVY = ["plotext", "PIL", "apscheduler"]
+MODES = [
+    # name, arguments, heavy modules not allowed
+    ("help", ["-h"], HEAVY),
+    ("update", ["-c", "-e", "-n", "-u"], ["rich"] + HEAVY),
+]
+# Runs preview.py with the config of the benchmark, then writes the heavy
+# modules loaded (argv: preview, secret, report, modules...)
+RUNNER = """
+import os, sys, json, runpy, configparser
+end = sys.argv.index("--")
+preview, secret, report = sys.argv[1:4]
+sys.path.insert(0, os.path.dirname(preview))
+heavy = sys.argv[4:end]
+read = configparser.ConfigParser.read
+configparser.ConfigParser.read = lambda self, _, **kwargs: read(self, secret)
+import config
+config.check_config = lambda path, filename: None
+sys.argv = [preview] + sys.argv[end + 1:]
+try:
+    runpy.run_path(preview, run_name="__main__")
+except SystemExit:
+    pass
+finally:
+    with open(report, "w", encoding="utf-8") as _file:
+        json.dump([name for name in heavy if name in sys.modules], _file)
+"""
+
+
+def get_args():
+    """Get args"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--budget", type=float, default=1000, help="Milliseconds by mode"
+    )
+    parser.add_argument(
+        "--rounds", type=int, default=3, help="Runs by mode (the best)"
+    )
+    return parser.parse_args()
+
+
+def run(home, arguments, heavy):
+    """Milliseconds of a run and the heavy modules loaded"""
+    secret = f"{home}/secret.cfg"
+    report = f"{home}/report.json"
+    cookie = f"{tempfile.gettempdir()}/.wallet_cryptoatcost.cookie_bench"
+    if os.path.exists(cookie):
+        os.remove(cookie)
+    env = dict(
+        os.environ,
+        HOME=home,
+        MINER_REPLAY=f"{PWD}/fixtures",
+        MINER_REPLAY_LATENCY="0",
+    )
+    command = [sys.executable, "-c", RUNNER, PREVIEW, secret, report]
+    start = time.perf_counter()
+    subprocess.run(
+        command + heavy + ["--"] + arguments,
+        env=env,
+        cwd=home,
+        stdout=subprocess.DEVNULL,
+        check=True,
+    )
+    seconds = time.perf_counter() - start
+    with open(report, encoding="utf-8") as _file:
+        return seconds * 1000, json.load(_file)
+
+
+def main():
+    """Main"""
+    args = get_args()
+    home = tempfile.mkdtemp(prefix="bench_startup_")
+    with open(f"{home}/secret.cfg", "w", encoding="utf-8") as _file:
+        _file.write(SECRET)
+    failures = 0
+    print(f"{'mode':<8} {'best ms':>9} {'budget':>8}  heavy modules")
+    for name, arguments, heavy in MODES:
+        results = [run(home, arguments, heavy) for _ in range(args.rounds)]
+        best = min(seconds for seconds, _ in results)
+        loaded = sorted({item for _, found in results for item in found})
+        flag = ""
+        if best > args.budget or loaded:
+            flag = " OVER BUDGET"
+            failures += 1
+        print(
+            f"{name:<8} {best:9.1f} {args.budget:8g}  "
+            f"{', '.join(loaded) or '-'}{flag}"
+        )
+    shutil.rmtree(home)
+    print(f"\n{failures} failures")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+""" synthetic.py - fill a database with a synthetic history of unpaids
+    v0.0.2 - 2026-10-19 - nelbren@nelbren.com
+
+    Every 4 hours (with some minutes of jitter) each source earns a bit
+    more, after a payout (about a week) the value starts again in a new
+    work. The last rows are close to now, so they cross day boundaries
+    like the real history."""
+import random
+from datetime import datetime, timedelta
+
+TS_FMT = "%Y-%m-%d %H:%M:%S"
+SOURCES = {
+    # source: (currency, earned by step, price in usd)
+    "ethermine": ("eth", 0.0009, 1800.0),
+    "cryptoatcost": ("btc", 0.00003, 30000.0),
+    "nicehash": ("btc", 0.00002, 30000.0),
+}
+CADENCE = timedelta(hours=4)
+JITTER = 10  # Minutes
+PAYOUT = 42  # Steps by work (a week)
+BATCH = 5000
+
+
+def get_rows(source, rows, seed=0):
+    """Rows of the history of a source, oldest first"""
+    currency, earned, price = SOURCES[source]
+    rnd = random.Random(f"{seed}-{source}")
+    timestamp = datetime.now().replace(microsecond=0) - CADENCE * rows
+    work, step, value = 1, 1, 0.0
+    for _ in range(rows):
+        jitter = timedelta(minutes=rnd.randint(-JITTER, JITTER))
+        value += earned * rnd.uniform(0.5, 1.5)
+        price *= rnd.uniform(0.98, 1.02)
+        yield {
+            "source": source,
+            "currency": currency,
+            "work": work,
+            "step": step,
+            "timestamp": (timestamp + jitter).strftime(TS_FMT),
+            "value": round(value, 8),
+            "usd": round(value * price, 2),
+            "last_seen": (timestamp + jitter).strftime(TS_FMT),
+            "observations": 1,
+        }
+        timestamp += CADENCE
+        step += 1
+        if step > PAYOUT:
+            work, step, value = work + 1, 1, 0.0
+
+
+def generate(rows, seed=0):
+    """Insert the rows, split between the sources"""
+    # pylint: disable=import-outside-toplevel
+    from database import db, Unpaid
+
+    share = rows // len(SOURCES)
+    batch = []
+    with db.atomic():
+        for index, source in enumerate(SOURCES):
+            count = share + (rows % len(SOURCES) if index == 0 else 0)
+            for row in get_rows(source, count, seed):
+                batch.append(row)
+                if len(batch) == BATCH:
+                    Unpaid.insert_many(batch).execute()
+                    batch = []
+        if batch:
+            Unpaid.insert_many(batch).execute()
@@ -1,6 +1,6 @@
 #!/usr/bin/python3
 """ big_text.py - show custom big numbers
-    v0.0.9 - 2022-05-18 - nelbren@nelbren.com"""
+    v0.1.1 - 2026-10-19 - nelbren@nelbren.com"""
 from rich.console import Console
 
 no0 = [
@@ -296,9 +296,10 @@ def add_title(console, source):
     )
 
 
-def show_big(usds, vals, tags, colors, size_term):
+def show_big(usds, vals, tags, colors, size_term, console=None):
     """Show big numbers"""
-    console = Console(record=True, width=size_term["columns"])
+    if console is None:
+        console = Console(width=size_term["columns"])
     numbers = {}
 
     if "usd_ethermine" in usds:
@@ -0,0 +1,86 @@
+#!/usr/bin/python3
+""" cadence.py - learn when each source updates and when to poll it
+    v0.0.3 - 2026-10-19 - nelbren@nelbren.com"""
+from datetime import datetime, timedelta
+from statistics import median
+from database import Unpaid
+
+TS_FMT = "%Y-%m-%d %H:%M:%S"
+SAMPLES = 24  # Last changes used to learn the cadence
+DEFAULT = timedelta(hours=4)  # Without history
+SHORTEST = timedelta(minutes=10)
+LONGEST = timedelta(days=1)
+MARGIN = timedelta(minutes=2)  # Poll just after the expected change
+RETRY = timedelta(minutes=10)  # First retry when the change is late
+STALE = 1.5  # Cycles without changes to flag the data as old
+MISSES = {}  # Polls without a new value, by source
+
+
+def get_timestamps(source, currency):
+    """Timestamps of the last changes, newest first"""
+    unpaids = (
+        Unpaid.select(Unpaid.timestamp)
+        .where((Unpaid.source == source) & (Unpaid.currency == currency))
+        .order_by(Unpaid.timestamp.desc())
+        .limit(SAMPLES + 1)
+    )
+    return [datetime.strptime(unpaid.timestamp, TS_FMT) for unpaid in unpaids]
+
+
+def get_interval(source, currency, timestamps=None):
+    """Typical time between two changes of the source"""
+    if timestamps is None:
+        timestamps = get_timestamps(source, currency)
+    diffs = [
+        (newer - older).total_seconds()
+        for newer, older in zip(timestamps, timestamps[1:])
+    ]
+    if not diffs:
+        return DEFAULT
+    interval = timedelta(seconds=median(diffs))
+    return min(max(interval, SHORTEST), LONGEST)
+
+
+def get_next_change(source, currency):
+    """Predicted time of the next change (None without data)"""
+    timestamps = get_timestamps(source, currency)
+    if not timestamps:
+        return None
+    return timestamps[0] + get_interval(source, currency, timestamps)
+
+
+def get_next_poll(source, currency, now=None):
+    """Time to poll: just after the next change or, when it is late,
+    retry backing off while the value doesn't change"""
+    now = now or datetime.now().replace(microsecond=0)
+    timestamps = get_timestamps(source, currency)
+    if not timestamps:
+        return now + RETRY
+    interval = get_interval(source, currency, timestamps)
+    expected = timestamps[0] + interval + MARGIN
+    if expected > now:
+        return expected
+    retry = RETRY * 2 ** MISSES.get(source, 0)
+    return now + min(retry, interval)
+
+
+def get_last_seen(unpaid):
+    """Last poll that read the value of the unpaid"""
+    return datetime.strptime(unpaid.last_seen or unpaid.timestamp, TS_FMT)
+
+
+def is_stale(source, currency, timestamp, now):
+    """The last poll that got data (last_seen) is older than expected"""
+    interval = get_interval(source, currency)
+    return now - timestamp > interval * STALE
+
+
+def register(unpaid_save):
+    """Count the polls without a new value"""
+    for source, unpaid_id in unpaid_save.items():
+        if not isinstance(unpaid_id, int):
+            continue  # Failed, the circuit breaker takes care
+        if unpaid_id:
+            MISSES[source] = 0
+        else:
+            MISSES[source] = MISSES.get(source, 0) + 1
@@ -1,6 +1,6 @@
 #!/usr/bin/python3
 """ chart.py - display information as a chart
-    v0.0.2 - 2022-05-07 - nelbren@nelbren.com"""
+    v0.0.3 - 2026-10-19 - nelbren@nelbren.com"""
 import asciichartpy
 from math import cos
 from math import pi
@@ -24,8 +24,8 @@ def asciichartpy():
     values = []
     usds = []
     for unpaid in reversed(unpaids):
-        values.append(unpaid.value)
-        usds.append(unpaid.usd)
+        values.append(float(unpaid.value))
+        usds.append(float(unpaid.usd))
         print(unpaid)
     test = [
         random.randint(1, 15) * cos(i * ((pi * 4) / width))
@@ -62,8 +62,8 @@ def show_chart(source, currency):
     usds = []
     timestamps = []
     for unpaid in reversed(unpaids):
-        values.append(unpaid.value)
-        usds.append(unpaid.usd)
+        values.append(float(unpaid.value))
+        usds.append(float(unpaid.usd))
         timestamps.append(unpaid.timestamp)
     plt.subplots(2, 1)
 
@@ -1,33 +1,48 @@
 #!/usr/bin/python3
 """ chart.py - display information as a chart
-    v0.0.6 - 2022-05-18 - nelbren@nelbren.com"""
-from database import db, Unpaid
+    v0.0.9 - 2026-10-19 - nelbren@nelbren.com"""
+import threading
+from peewee import fn
+from rich.segment import Segment
+from rich.style import Style
 import plotext as plt
 from plotext._utility.color import uncolorize
+from database import Unpaid
+from rollup import get_buckets
 
+STYLES = [Style.parse("cyan on black"), Style.parse("magenta on black")]
+LOCK = threading.Lock()  # plotext keeps the figure in a global state
+CACHE = {}
 
-def show_chart(source, currency, size_term, show=False):
-    """Show Chart"""
-    days = 7
-    measure_per_day = 6
-    width = days * measure_per_day
-    records = width
-    # source, currency = "cryptoatcost", "btc"
-    unpaids = (
-        Unpaid.select()
+
+def get_version(source, currency):
+    """Version of the data (last id)"""
+    return (
+        Unpaid.select(fn.MAX(Unpaid.id))
         .where((Unpaid.source == source) & (Unpaid.currency == currency))
-        .order_by(Unpaid.timestamp.desc())
-        .limit(records)
+        .scalar()
+    )
+
+
+def get_yticks(values, count=5):
+    """Ticks with fixed decimals, plotext fails with values like 5e-05"""
+    if not values:
+        return [], []
+    low, high = min(values), max(values)
+    step = (high - low) / (count - 1) or 1
+    ticks = [low + step * index for index in range(count)]
+    return ticks, [f"{tick:.8f}" for tick in ticks]
+
+
+def build_chart(source, currency, size_term, window, buckets):
+    """Build Chart"""
+    timestamps, values, usds = get_buckets(source, currency, window, buckets)
+    title = (
+        f"Mining {currency.upper()} at {source.upper()} ({window}) "
+        "represented in"
     )
-    # print(unpaids)
-    values = []
-    usds = []
-    timestamps = []
-    for unpaid in reversed(unpaids):
-        values.append(unpaid.value)
-        usds.append(unpaid.usd)
-        timestamps.append(unpaid.timestamp)
-    title = f"Mining {currency.upper()} at {source.upper()} represented in"
+    plt.main()
+    plt.clf()
     plt.plot_size(size_term["columns"], 30)
     plt.limit_size(False)
     plt.subplots(2, 1)
@@ -43,12 +58,48 @@ def show_chart(source, currency, size_term, show=False):
     plt.clc()
     plt.date_form("Y-m-d H:M:S")
     plt.plot(timestamps, values, color="bright-magenta")
-    plt.title(f"{title} BTC")
+    plt.yticks(*get_yticks(values))
+    plt.title(f"{title} {currency.upper()}")
     plt.ticks_color("magenta")
+
+
+def show_chart(
+    source, currency, size_term, window="7d", buckets=42, show=False
+):
+    """Show Chart"""
     if show:
-        plt.show()
-    else:
-        return uncolorize(plt.build())
+        with LOCK:
+            build_chart(source, currency, size_term, window, buckets)
+            plt.show()
+        return None
+    key = (source, currency, size_term["columns"], window, buckets)
+    version = get_version(source, currency)
+    if key not in CACHE or CACHE[key][0] != version:
+        with LOCK:
+            build_chart(source, currency, size_term, window, buckets)
+            text = uncolorize(plt.build())
+        CACHE[key] = (version, text.splitlines())
+    return CACHE[key][1]
+
+
+class ChartText:
+    """Chart as a rich renderable, a style for each subplot"""
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, source, currency, size_term, window="7d", buckets=42):
+        self.lines = show_chart(source, currency, size_term, window, buckets)
+
+    # pylint: disable=unused-argument
+    def __rich_console__(self, console, options):
+        style, chart = None, 0
+        new_line = Segment.line()
+        for line in self.lines:
+            if "Mining" in line:
+                style = STYLES[chart]
+                chart += 1
+            yield Segment(line, style)
+            yield new_line
 
 
 if __name__ == "__main__":
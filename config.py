@@ -1,6 +1,6 @@
 #!/usr/bin/python3
 """ config.py - get configuration
-    v0.0.6 - 2022-05-07 - nelbren@nelbren.com """
+    v0.0.11 - 2026-10-19 - nelbren@nelbren.com """
 import os
 import sys
 import configparser
@@ -46,6 +46,18 @@ def get_config():
     section = "TELEGRAM"
     telegram_token = config.get(section, "TOKEN", fallback=None)
     telegram_id = config.get(section, "ID", fallback=None)
+    section = "DAEMON"
+    daemon_fetch = config.getint(section, "FETCH_MINUTES", fallback=0)
+    daemon_render = config.getint(section, "RENDER_MINUTES", fallback=240)
+    section = "GATEWAY"
+    gateway_url = config.get(section, "URL", fallback=None)
+    gateway_port = config.getint(section, "PORT", fallback=8642)
+    gateway_ttl = config.getint(section, "TTL_SECONDS", fallback=300)
+    section = "ARCHIVE"
+    archive_hot_days = config.getint(section, "HOT_DAYS", fallback=0)
+    section = "RETENTION"
+    retention_raw_days = config.getint(section, "RAW_DAYS", fallback=0)
+    retention_hour_days = config.getint(section, "HOUR_DAYS", fallback=0)
     return {
         "hostname": hostname,
         "username": username,
@@ -56,13 +68,21 @@ def get_config():
         "address": address,
         "etm_goal_usd": etm_goal_usd,
         "etm_goal_btc": etm_goal_btc,
-        "nch_org": NHbQh4sxVTJSUAFrKBPV9VP8aBW54FBiSoE5,
-        "nch_key": 314ba359-0ba3-4b90-b3c2-f34d3934b8b8
-        "nch_secret": 4da6f0a5-c970-49a7-bc89-3e0dafb8875744ea413e-9562-482d-91cc-1c0378f88776
-        "nch_goal_usd": 17000,
-        "nch_goal_btc": 1,
+        "nch_org": nch_org,
+        "nch_key": nch_key,
+        "nch_secret": nch_secret,
+        "nch_goal_usd": nch_goal_usd,
+        "nch_goal_btc": nch_goal_btc,
         "mail_from": mail_from,
         "mail_to": mail_to,
         "telegram_token": telegram_token,
         "telegram_id": telegram_id,
+        "daemon_fetch": daemon_fetch,
+        "daemon_render": daemon_render,
+        "gateway_url": gateway_url,
+        "gateway_port": gateway_port,
+        "gateway_ttl": gateway_ttl,
+        "archive_hot_days": archive_hot_days,
+        "retention_raw_days": retention_raw_days,
+        "retention_hour_days": retention_hour_days,
     }
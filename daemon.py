@@ -0,0 +1,126 @@
+#!/usr/bin/python3
+""" daemon.py - update and send the data on schedule
+    v0.0.8 - 2026-10-19 - nelbren@nelbren.com"""
+import os
+from datetime import datetime, timedelta
+from apscheduler.schedulers.blocking import BlockingScheduler
+from apscheduler.executors.pool import ThreadPoolExecutor
+import fetch
+import notify
+from render_session import RenderSession
+from timing import span
+
+TS_FMT = "%Y-%m-%d %H:%M:%S"
+
+
+def fetch_job(params, scheduler=None):
+    """Update the database, without a fixed interval the next fetch is
+    scheduled just after the next expected change (after a failure too,
+    or the adaptive fetches would stop)"""
+    try:
+        with span("refresh.fetch"):
+            unpaid_save = fetch.fetch_data(params)
+    # pylint: disable=broad-except
+    except Exception as exception:
+        unpaid_save = f"{type(exception).__name__}: {exception}"
+    timestamp = datetime.now().strftime(TS_FMT)
+    msg = f"{timestamp} => {unpaid_save}"
+    if scheduler:
+        next_poll = fetch.next_poll(params)
+        msg += f" change ~ {fetch.next_change(params)} poll @ {next_poll}"
+        scheduler.add_job(
+            fetch_job,
+            "date",
+            run_date=next_poll,
+            args=[params, scheduler],
+            id="fetch",
+            replace_existing=True,
+        )
+    print(msg, flush=True)
+
+
+def render_job(params, size_term, render):
+    """Render the data and send it (the errors of the deliveries are shown
+    when they end, without holding the worker of the fetches)"""
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        session = RenderSession(size_term, record=True, file=devnull)
+        with span("refresh.render"):
+            numbers, tag, image, next_update = render(params, session)
+    for future in notify.deliver(params, numbers, tag, next_update, image):
+        future.add_done_callback(notify.show_error)
+    timestamp = datetime.now().strftime(TS_FMT)
+    print(
+        f"{timestamp} => image {len(image)} bytes, "
+        f"recording {session.buffer_size()} segments",
+        flush=True,
+    )
+
+
+def maintenance_job(params):
+    """Archive the old history first, then apply the retention"""
+    # pylint: disable=import-outside-toplevel
+    cfg = params["cfg"]
+    msg = datetime.now().strftime(TS_FMT) + " =>"
+    if cfg["archive_hot_days"]:
+        import archive
+
+        moved = archive.archive(cfg["archive_hot_days"])
+        msg += f" archived {sum(moved.values())} rows"
+    if cfg["retention_raw_days"] or cfg["retention_hour_days"]:
+        import retention
+
+        msg += " " + retention.get_message(*retention.compact(cfg), False)
+    print(msg, flush=True)
+
+
+def run_daemon(params, size_term, render):
+    """Run the jobs in this process, sessions and connections stay warm"""
+    cfg = params["cfg"]
+    # Only one worker: the jobs share the panels, the db and plotext
+    scheduler = BlockingScheduler(
+        executors={"default": ThreadPoolExecutor(1)},
+        job_defaults={"coalesce": True, "max_instances": 1},
+    )
+    now = datetime.now()
+    if cfg["daemon_fetch"]:
+        scheduler.add_job(
+            fetch_job,
+            "interval",
+            minutes=cfg["daemon_fetch"],
+            args=[params],
+            id="fetch",
+            next_run_time=now,
+        )
+    else:  # Adaptive, learned from the cadence of the sources
+        scheduler.add_job(
+            fetch_job,
+            "date",
+            run_date=now,
+            args=[params, scheduler],
+            id="fetch",
+        )
+    scheduler.add_job(
+        render_job,
+        "interval",
+        minutes=cfg["daemon_render"],
+        args=[params, size_term, render],
+        id="render",
+        next_run_time=now + timedelta(minutes=1),
+    )
+    if (
+        cfg["archive_hot_days"]
+        or cfg["retention_raw_days"]
+        or cfg["retention_hour_days"]
+    ):
+        scheduler.add_job(
+            maintenance_job,
+            "interval",
+            days=1,
+            args=[params],
+            id="maintenance",
+            next_run_time=now + timedelta(minutes=5),
+        )
+    try:
+        scheduler.start()
+    except KeyboardInterrupt:
+        scheduler.shutdown(wait=False)
@@ -1,15 +1,26 @@
 #!/usr/bin/python3
 """ database.py - get persistence for data
-    v0.0.4 - 2022-01-27 - nelbren@nelbren.com"""
+    v0.0.11 - 2026-10-19 - nelbren@nelbren.com"""
 import os
+from decimal import Decimal
 from pathlib import Path
-from peewee import SqliteDatabase, Model, CharField, IntegerField, FloatField
+from peewee import (
+    SqliteDatabase,
+    Model,
+    CharField,
+    IntegerField,
+    FloatField,
+    BooleanField,
+    ForeignKeyField,
+    SQL,
+)
+from units import VALUE_PLACES, USD_PLACES, PRICE_PLACES, to_units
 
 HOME = str(Path.home())
 PWD = os.path.dirname(os.path.realpath(__file__))
 PWD_DIR = os.path.basename(PWD)
 BASE = f"{HOME}/.{PWD_DIR}.db"
-db = SqliteDatabase(BASE)
+db = SqliteDatabase(BASE, pragmas={"auto_vacuum": "incremental"})  # New dbs
 
 
 class BaseModel(Model):
@@ -22,6 +33,24 @@ class BaseModel(Model):
         database = db
 
 
+class FixedField(IntegerField):
+    """Exact amount (Decimal) stored as an integer of base units"""
+
+    def __init__(self, places, *args, **kwargs):
+        self.places = places
+        super().__init__(*args, **kwargs)
+
+    def db_value(self, value):
+        if value is None:
+            return None
+        return to_units(value, self.places)
+
+    def python_value(self, value):
+        if value is None:
+            return None
+        return Decimal(value).scaleb(-self.places)
+
+
 class Unpaid(BaseModel):
     """Unpaid table"""
 
@@ -30,8 +59,12 @@ class Unpaid(BaseModel):
     work = IntegerField()
     step = IntegerField()
     timestamp = CharField(max_length=18)
-    value = FloatField()
-    usd = FloatField()
+    value = FixedField(VALUE_PLACES)
+    usd = FixedField(USD_PLACES)
+    last_seen = CharField(max_length=19, null=True)  # Last poll of the value
+    observations = IntegerField(  # Polls with the same value
+        default=1, constraints=[SQL("DEFAULT 1")]
+    )
 
     class Meta:
         """Metadata"""
@@ -41,6 +74,7 @@ class Unpaid(BaseModel):
         indexes = (
             (("source", "currency", "work", "step", "timestamp"), True),
             (("source", "currency", "work", "step"), True),
+            (("source", "currency", "timestamp"), False),
         )
 
     def __str__(self):
@@ -50,3 +84,162 @@ class Unpaid(BaseModel):
             f"WKR: {self.work} STP: {self.step} "
             f"VAL: {self.value} USD: {self.usd}"
         )
+
+
+class Delta(BaseModel):
+    """Delta table, fields derived from an Unpaid row and the previous one"""
+
+    unpaid = ForeignKeyField(
+        Unpaid, backref="deltas", unique=True, on_delete="CASCADE"
+    )
+    ts_int = IntegerField()  # ±ts
+    ts_short = CharField(max_length=12)
+    value = FixedField(VALUE_PLACES)  # ±value
+    value2 = FixedField(VALUE_PLACES)  # ±(±val)
+    usd = FixedField(USD_PLACES)  # ±usd
+    value_first = FixedField(VALUE_PLACES)  # value at the end of a date
+    usd_first = FixedField(USD_PLACES)
+    value_avg = FixedField(VALUE_PLACES)  # ~value
+    count_avg = IntegerField()
+    last_usd_diff = FixedField(USD_PLACES)
+    day = BooleanField()  # First row of a date, with the summary of the last
+    day_value = FixedField(VALUE_PLACES)
+    day_avg = FixedField(VALUE_PLACES)
+    day_usd = FixedField(USD_PLACES)
+    day_usd_diff = FixedField(USD_PLACES)
+
+    class Meta:
+        """Metadata"""
+
+        # pylint: disable=too-few-public-methods
+        db_table = "delta"
+
+
+class Rollup(BaseModel):
+    """Rollup table, last value of the unpaids by hour and by day"""
+
+    source = CharField(max_length=50)
+    currency = CharField(max_length=3)
+    period = CharField(max_length=4)  # hour | day
+    bucket = CharField(max_length=19)  # timestamp of the beginning
+    value = FloatField()
+    usd = FloatField()
+    value_min = FloatField()
+    value_max = FloatField()
+    count = IntegerField()
+
+    class Meta:
+        """Metadata"""
+
+        # pylint: disable=too-few-public-methods
+        db_table = "rollup"
+        indexes = ((("source", "currency", "period", "bucket"), True),)
+
+
+class Stat(BaseModel):
+    """Stat table, running statistics of the current payout of a source
+    (Welford updates, hours since the first unpaid of the payout)"""
+
+    source = CharField(max_length=50)
+    currency = CharField(max_length=3)
+    since = CharField(max_length=19)  # First unpaid of the payout
+    last = CharField(max_length=19)  # Last unpaid
+    last_value = FloatField()
+    last_usd = FloatField()
+    count = IntegerField()
+    mean_hours = FloatField()
+    mean_value = FloatField()
+    mean_usd = FloatField()
+    m2_hours = FloatField()  # Σ(hours - mean)²
+    c_value = FloatField()  # Σ(hours - mean)(value - mean)
+    c_usd = FloatField()
+    rate_count = IntegerField()  # ±value / hours of each change
+    rate_mean = FloatField()
+    rate_m2 = FloatField()
+
+    class Meta:
+        """Metadata"""
+
+        # pylint: disable=too-few-public-methods
+        db_table = "stat"
+        indexes = ((("source", "currency"), True),)
+
+
+class Price(BaseModel):
+    """Price table, usd of a coin each time it changes (ticks)"""
+
+    currency = CharField(max_length=3)
+    timestamp = CharField(max_length=19)
+    usd = FixedField(PRICE_PLACES)
+
+    class Meta:
+        """Metadata"""
+
+        # pylint: disable=too-few-public-methods
+        db_table = "price"
+        indexes = ((("currency", "timestamp"), True),)
+
+
+def get_float_columns(model):
+    """Fixed fields of the model still stored as floats (old databases)"""
+    # pylint: disable=protected-access
+    types = {
+        column.name: column.data_type.upper()
+        for column in db.get_columns(model._meta.table_name)
+    }
+    return [
+        field
+        for field in model._meta.sorted_fields
+        if isinstance(field, FixedField)
+        and types.get(field.column_name) in ("REAL", "FLOAT")
+    ]
+
+
+def migrate_fixed(migrator, run):
+    """Store the amounts of the floats as integers of base units"""
+    # pylint: disable=protected-access
+    for model in [Unpaid, Delta]:
+        fields = get_float_columns(model)
+        if not fields:
+            continue
+        table = model._meta.table_name
+        # The integer affinity first, then the floats become integers
+        run(
+            *[
+                migrator.alter_column_type(
+                    table, field.column_name, IntegerField()
+                )
+                for field in fields
+            ]
+        )
+        db.execute_sql(
+            f'UPDATE "{table}" SET '
+            + ", ".join(
+                f'"{field.column_name}" = CAST(ROUND('
+                f'"{field.column_name}" * 1e{field.places}) AS INTEGER)'
+                for field in fields
+            )
+        )
+
+
+def migrate():
+    """Add the columns and the tables of the newer versions to an old
+    database"""
+    # pylint: disable=import-outside-toplevel
+    from playhouse.migrate import SqliteMigrator, migrate as run
+
+    columns = [column.name for column in db.get_columns("unpaid")]
+    if not columns:
+        return
+    migrator = SqliteMigrator(db)
+    with db.atomic():
+        db.create_tables([Price])
+        if "last_seen" not in columns:
+            run(
+                migrator.add_column("unpaid", "last_seen", Unpaid.last_seen),
+                migrator.add_column(
+                    "unpaid", "observations", Unpaid.observations
+                ),
+            )
+            Unpaid.update(last_seen=Unpaid.timestamp).execute()
+        migrate_fixed(migrator, run)
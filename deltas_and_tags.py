@@ -1,11 +1,18 @@
 #!/usr/bin/python3
 """ deltas_and_tags.py - set deltas and tags
-    v0.0.5 - 2022-05-07 - nelbren@nelbren.com"""
+    v0.0.10 - 2026-10-19 - nelbren@nelbren.com"""
 
+from decimal import Decimal
 from datetime import datetime, timedelta
+from peewee import JOIN
 from config import get_config
+from database import db, Unpaid, Delta
+import cadence
+import stats
+from units import VALUE_PLACES, round_units
 
 TS_FMT = "%Y-%m-%d %H:%M:%S"
+ZERO = Decimal(0)
 
 
 def ts_to_int(timediff):
@@ -76,11 +83,14 @@ def tags_row(tag, last_unpaid, unpaid, last_delta, delta):
 
 def tags_title(tag, last_unpaid, timestamp):
     """Set tag colors to title"""
-    diff_ts_now = datetime.strptime(timestamp, TS_FMT) - datetime.strptime(
-        last_unpaid.timestamp, TS_FMT
+    stale = cadence.is_stale(
+        last_unpaid.source,
+        last_unpaid.currency,
+        cadence.get_last_seen(last_unpaid),
+        datetime.strptime(timestamp, TS_FMT),
     )
     tag["style"] = "black on "
-    if diff_ts_now > timedelta(hours=4):
+    if stale:
         color, tag["ok"] = "red", "✖"
     else:
         color, tag["ok"] = "green", "✔"
@@ -138,13 +148,40 @@ def get_goals(miner):
     return cfg["etm_goal_usd"], cfg["etm_goal_btc"]
 
 
+def get_rate_msg(source, currency, tag, goal_usd, goal_val):
+    """Earning rate (USD by day) and ETA to the goal"""
+    stat = stats.get_stat(source, currency)
+    slope = stats.get_slope(stat, "usd")
+    tag[f"{source}_usd_day"] = tag[f"{source}_eta"] = None
+    if slope is None:
+        return ""
+    if goal_usd:
+        eta = stats.get_eta(stat, "usd", goal_usd)
+    else:
+        eta = stats.get_eta(stat, "value", goal_val)
+    tag[f"{source}_usd_day"], tag[f"{source}_eta"] = slope * 24, eta
+    msg = f"📈{slope * 24:.2f}/d"
+    if eta is not None:
+        if eta.year == datetime.now().year:
+            msg += f"⏳{eta:%m-%d}"
+        else:
+            msg += f"⏳{eta:%Y-%m}"
+    return msg
+
+
 def get_goal_msg(source, currency, tag, unpaid, size_term):
     """Goal Message"""
     goal_usd, goal_val = get_goals(source)
+    rate_msg = get_rate_msg(source, currency, tag, goal_usd, goal_val)
+    rate_cols = len(rate_msg) + rate_msg.count("📈") + rate_msg.count("⏳")
     if not goal_usd and not goal_val:
-        return ""
+        return f"|{rate_msg} " if rate_msg else ""
 
     rest_cols = size_term["columns"] - 37
+    if rest_cols - rate_cols < 20:  # The bars first
+        rate_msg = ""
+    else:
+        rest_cols -= rate_cols
     items = 0
     if goal_usd:
         items += 1
@@ -159,18 +196,18 @@ def get_goal_msg(source, currency, tag, unpaid, size_term):
         tag, currency.upper(), goal_val, unpaid.value, items_cols
     )
     tag[f"{source}_goal_pm_val"] = tag["goal_pm"]
-    return f"|{goal_msg_detail} "
+    return f"|{goal_msg_detail}{rate_msg} "
 
 
 def set_deltas_empty(unpaid, delta):
     """Delta empty"""
     delta["timestamp"] = "0"
     delta["date"], delta["time"] = unpaid.timestamp.split(" ")
-    delta["±value"] = delta["±±value"] = 0
-    delta["±usd"] = delta["±usd_sum"] = 0
-    delta["btc_diff"] = delta["usd_diff"] = 0
-    delta["last_usd_diff"] = 0
-    delta["~value"] = delta["~count"] = 0
+    delta["±value"] = delta["±±value"] = ZERO
+    delta["±usd"] = delta["±usd_sum"] = ZERO
+    delta["btc_diff"] = delta["usd_diff"] = ZERO
+    delta["last_usd_diff"] = ZERO
+    delta["~value"], delta["~count"] = ZERO, 0
     delta["ts_short"] = "00:00"
 
 
@@ -200,3 +237,185 @@ def set_deltas(last_unpaid, unpaid, last_delta, delta):
     if unpaid.timestamp[:10] != last_unpaid.timestamp[:10]:
         delta["btc_diff"] = last_unpaid.value - delta["btc_first"]
         delta["usd_diff"] = last_unpaid.usd - delta["usd_first"]
+
+
+def get_summary(delta):
+    """Summary of the date (row date)"""
+    summary = {
+        "date": delta["date"],
+        "btc_diff": delta["btc_diff"],
+        "~value": delta["~value"],
+        "usd_diff": delta["usd_diff"],
+    }
+    if delta["~count"]:  # Rounded as stored, the same after a reload
+        summary["~value"] = round_units(
+            summary["~value"] / delta["~count"], VALUE_PLACES
+        )
+    summary["±usd_diff"] = delta["usd_diff"] - delta["last_usd_diff"]
+    return summary
+
+
+def get_summary_empty(delta):
+    """Summary without information"""
+    return {
+        "date": delta["date"],
+        "btc_diff": ZERO,
+        "~value": ZERO,
+        "usd_diff": ZERO,
+        "±usd_diff": ZERO,
+    }
+
+
+def get_last_summary(delta, last_unpaid):
+    """Summary of the date in progress"""
+    last_delta = delta.copy()
+    last_delta["date"] = ""
+    last_delta["btc_diff"] = last_unpaid.value - delta["btc_first"]
+    last_delta["usd_diff"] = last_unpaid.usd - delta["usd_first"]
+    last_delta["~count"] += 1
+    return get_summary(last_delta)
+
+
+def set_deltas_date(last_unpaid, unpaid, delta):
+    """Delta of a new date"""
+    delta["±usd_sum"] = 0
+    if last_unpaid is None:
+        delta["btc_first"], delta["usd_first"] = unpaid.value, unpaid.usd
+    else:
+        delta["btc_first"], delta["usd_first"] = (
+            last_unpaid.value,
+            last_unpaid.usd,
+        )
+    summary = get_summary(delta)
+    delta["~value"] = summary["~value"]
+    delta["last_usd_diff"] = delta["usd_diff"]
+    delta["~count"] = 0
+    return summary
+
+
+def next_deltas(last_unpaid, unpaid, last_delta):
+    """Deltas of unpaid using the deltas of the previous row"""
+    if last_unpaid is None:
+        delta = {}
+        set_deltas_empty(unpaid, delta)
+    else:
+        delta = last_delta.copy()
+        set_deltas(last_unpaid, unpaid, last_delta, delta)
+    summary = None
+    if last_unpaid is None or delta["date"] != last_delta["date"]:
+        summary = set_deltas_date(last_unpaid, unpaid, delta)
+    return delta, summary
+
+
+def load_deltas(unpaid, row):
+    """Deltas from the delta table"""
+    delta = {
+        "timestamp": row.ts_int,
+        "ts_short": row.ts_short,
+        "±value": row.value,
+        "±±value": row.value2,
+        "±usd": row.usd,
+        "±usd_sum": ZERO,
+        "btc_first": row.value_first,
+        "usd_first": row.usd_first,
+        "~value": row.value_avg,
+        "~count": row.count_avg,
+        "btc_diff": row.day_value,
+        "usd_diff": row.day_usd,
+        "last_usd_diff": row.last_usd_diff,
+    }
+    delta["date"], delta["time"] = unpaid.timestamp.split(" ")
+    summary = None
+    if row.day:
+        summary = {
+            "date": delta["date"],
+            "btc_diff": row.day_value,
+            "~value": row.day_avg,
+            "usd_diff": row.day_usd,
+            "±usd_diff": row.day_usd_diff,
+        }
+    return delta, summary
+
+
+def save_deltas(unpaid, delta, summary):
+    """Save the deltas to the delta table"""
+    day = summary is not None
+    if not day:
+        summary = get_summary_empty(delta)
+    return Delta.create(
+        unpaid=unpaid,
+        ts_int=ts_to_int(delta["timestamp"]),
+        ts_short=delta["ts_short"],
+        value=delta["±value"],
+        value2=delta["±±value"],
+        usd=delta["±usd"],
+        value_first=delta["btc_first"],
+        usd_first=delta["usd_first"],
+        value_avg=delta["~value"],
+        count_avg=delta["~count"],
+        last_usd_diff=delta["last_usd_diff"],
+        day=day,
+        day_value=summary["btc_diff"],
+        day_avg=summary["~value"],
+        day_usd=summary["usd_diff"],
+        day_usd_diff=summary["±usd_diff"],
+    )
+
+
+def query_unpaids(source, currency):
+    """Select unpaids of source and currency with their deltas"""
+    return (
+        Unpaid.select(Unpaid, Delta)
+        .join(
+            Delta,
+            JOIN.LEFT_OUTER,
+            on=(Delta.unpaid == Unpaid.id),
+            attr="delta",
+        )
+        .where((Unpaid.source == source) & (Unpaid.currency == currency))
+    )
+
+
+def has_deltas(unpaid):
+    """The unpaid was selected with its deltas"""
+    return getattr(unpaid, "delta", None) is not None and unpaid.delta.id
+
+
+def add_deltas(last_unpaid, unpaid):
+    """Save the deltas of a new unpaid, last_unpaid is the previous row"""
+    last_delta = None
+    if last_unpaid is not None:
+        row = Delta.get_or_none(Delta.unpaid == last_unpaid.id)
+        if row is None:
+            backfill_deltas()
+            return
+        last_delta, _ = load_deltas(last_unpaid, row)
+    delta, summary = next_deltas(last_unpaid, unpaid, last_delta)
+    save_deltas(unpaid, delta, summary)
+
+
+def backfill_deltas():
+    """Save the deltas of the unpaids without them (old databases)"""
+    groups = list(
+        Unpaid.select(Unpaid.source, Unpaid.currency)
+        .join(Delta, JOIN.LEFT_OUTER, on=(Delta.unpaid == Unpaid.id))
+        .where(Delta.id.is_null())
+        .distinct()
+    )
+    for group in groups:
+        unpaids = list(
+            query_unpaids(group.source, group.currency).order_by(
+                Unpaid.work, Unpaid.step
+            )
+        )
+        last_unpaid = last_delta = None
+        with db.atomic():
+            for unpaid in unpaids:
+                if has_deltas(unpaid):
+                    delta, _ = load_deltas(unpaid, unpaid.delta)
+                else:
+                    delta, summary = next_deltas(
+                        last_unpaid, unpaid, last_delta
+                    )
+                    save_deltas(unpaid, delta, summary)
+                last_unpaid, last_delta = unpaid, delta
@@ -0,0 +1,200 @@
+#!/usr/bin/python3
+""" fetch.py - get the data from the miners and save it
+    v0.0.15 - 2026-10-19 - nelbren@nelbren.com"""
+import time
+import socket
+from datetime import datetime
+import peewee
+from database import Unpaid
+from deltas_and_tags import add_deltas
+from rollup import save_rollups
+from stats import save_stats
+from prices import save_price
+import cadence
+import metrics
+from timing import span
+from units import VALUE_PLACES, USD_PLACES, round_units
+
+TS_FMT = "%Y-%m-%d %H:%M:%S"
+SOURCES = {"ethermine": "eth", "cryptoatcost": "btc", "nicehash": "btc"}
+PANELS = {}  # Warm sessions, reused between fetches
+
+
+class UnknownSource(ValueError):
+    """Raised when the source isn't one of SOURCES"""
+
+
+def get_panel(source):
+    """Panel of the source, created once"""
+    # pylint: disable=import-outside-toplevel
+    if source not in PANELS:
+        if source == "ethermine":
+            from mining.ethermine import ETMPanel as Panel
+        elif source == "cryptoatcost":
+            from mining.cryptoatcost import CACPanel as Panel
+        elif source == "nicehash":
+            from mining.nicehash import NCHPanel as Panel
+        else:
+            raise UnknownSource(source)
+        with span("login", source=source):
+            PANELS[source] = Panel()
+    return PANELS[source]
+
+
+def save_data(source, currency, value, usd, price=None):
+    """Save record, and the price tick (a price that changes without the
+    value is only a tick)"""
+    if value == -1:
+        return 0
+    timestamp = datetime.now().strftime(TS_FMT)
+    if price is not None:
+        save_price(currency, price, timestamp)
+    # Only the base units are stored, the same units are the same value
+    value = round_units(value, VALUE_PLACES)
+    usd = round_units(usd, USD_PLACES)
+    try:
+        unpaid = (
+            Unpaid.select()
+            .where((Unpaid.source == source) & (Unpaid.currency == currency))
+            .order_by(Unpaid.work.desc(), Unpaid.step.desc())
+            .get()
+        )
+    except peewee.DoesNotExist:
+        last_unpaid = None
+        last_value, work, step = 0, 1, 1
+    else:
+        last_unpaid = unpaid
+        last_value, work, step = unpaid.value, unpaid.work, unpaid.step + 1
+
+    if last_value != value:
+        unpaid = Unpaid(
+            source=source,
+            currency=currency,
+            work=work,
+            step=step,
+            timestamp=timestamp,
+            value=value,
+            usd=usd,
+            last_seen=timestamp,
+        )
+        unpaid.save()
+        add_deltas(last_unpaid, unpaid)
+        save_rollups(unpaid)
+        save_stats(unpaid)
+        # pylint: disable=no-member
+        unpaid_save = unpaid.id
+    else:
+        if last_unpaid is not None:  # The same value, only a heartbeat
+            Unpaid.update(
+                last_seen=timestamp, observations=Unpaid.observations + 1
+            ).where(Unpaid.id == last_unpaid.id).execute()
+        unpaid_save = 0
+    return unpaid_save
+
+
+def get_data_remote(params, source):
+    """Get data using another host (a running agent)"""
+    # pylint: disable=import-outside-toplevel
+    from agent import get_agent
+
+    return get_agent(params["hostname"]).wallet(source)
+
+
+def get_data_local(source):
+    """Get data using this host (value, usd, price)"""
+    try:
+        panel = get_panel(source)
+        value, usd = panel.wallet()
+        return value, usd, panel.price
+    except Exception:
+        PANELS.pop(source, None)  # Login again the next time
+        raise
+
+
+def get_wallet_direct(params, source):
+    """Get data from a miner, remotely when it's another host"""
+    if (
+        source == "cryptoatcost"
+        and params["hostname"]
+        and params["hostname"] != socket.gethostname()
+    ):
+        return get_data_remote(params, source)
+    return get_data_local(source)
+
+
+def get_wallet(params, source):
+    """Get data from a miner, through the gateway when it's running"""
+    url = params["cfg"]["gateway_url"]
+    if url:
+        # pylint: disable=import-outside-toplevel
+        import requests
+        import gateway
+
+        try:
+            return gateway.get_wallet(url, source)
+        except requests.ConnectionError:
+            pass  # Not running
+        except (requests.RequestException, ValueError, KeyError) as error:
+            # Running but failing (timeout, invalid answer): not a second
+            # call to the pool from here
+            raise gateway.GatewayError(f"{source}: {error}") from error
+    return get_wallet_direct(params, source)
+
+
+def fetch_source(params, source):
+    """Get data from a miner and save it, the errors of the miner are
+    returned (a failing miner doesn't stop the others)"""
+    # pylint: disable=import-outside-toplevel
+    from mining.cryptoatcost import MaintenanceMode
+    from mining.resilience import UpstreamError
+
+    currency = SOURCES[source]
+    try:
+        with span("fetch.pool", source=source):
+            with metrics.timed("miner_fetch_seconds", source=source):
+                value, usd, price = get_wallet(params, source)
+    except MaintenanceMode:
+        return 0
+    except UpstreamError as error:
+        metrics.inc(
+            "miner_upstream_errors_total",
+            source=source,
+            error=type(error).__name__,
+        )
+        return error
+    metrics.set_gauge(
+        "miner_last_success_timestamp_seconds", time.time(), source=source
+    )
+    with span("db.write", source=source):
+        return save_data(source, currency, value, usd, price)
+
+
+def fetch_data(params):
+    """Get data from the miners"""
+    unpaid_save = {}
+    for source in SOURCES:
+        if params[source]:
+            unpaid_save[source] = fetch_source(params, source)
+    cadence.register(unpaid_save)
+    metrics.save()
+    return unpaid_save
+
+
+def next_change(params):
+    """Predicted time of the next change of the miners"""
+    changes = [
+        cadence.get_next_change(source, currency)
+        for source, currency in SOURCES.items()
+        if params[source]
+    ]
+    changes = [change for change in changes if change is not None]
+    return min(changes) if changes else None
+
+
+def next_poll(params):
+    """Time to get data again from the miners"""
+    return min(
+        cadence.get_next_poll(source, currency)
+        for source, currency in SOURCES.items()
+        if params[source]
+    )
@@ -0,0 +1,165 @@
+#!/usr/bin/python3
+""" gateway.py - serve cached wallets of the miners to local consumers
+    v0.0.5 - 2026-10-19 - nelbren@nelbren.com
+
+    GET /wallet/<source> -> {"source", "value", "usd", "price", "fetched"}
+    + ETag (the amounts are exact texts),
+    304 with If-None-Match, 502 with {"error", "message"} on failures.
+    Each source is fetched at most once per TTL, whatever the consumers."""
+import json
+import time
+import hashlib
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import requests
+import metrics
+from mining.resilience import UpstreamError
+from units import to_decimal
+
+TS_FMT = "%Y-%m-%d %H:%M:%S"
+ERROR_TTL = 60  # Seconds to keep an upstream failure
+SNAPSHOTS = {}  # Last answer of each source
+LOCKS = {}  # One upstream call at a time by source
+SESSION = requests.Session()
+ETAGS = {}  # Client side: last etag and data of each source
+
+
+class GatewayError(UpstreamError):
+    """Raised when the gateway can't get the data"""
+
+
+def get_etag(data):
+    """ETag of the data"""
+    text = json.dumps(data, sort_keys=True)
+    return '"' + hashlib.sha1(text.encode("utf-8")).hexdigest()[:16] + '"'
+
+
+def get_snapshot(params, source):
+    """Cached answer of the source, fetched again after the TTL"""
+    # pylint: disable=import-outside-toplevel
+    from fetch import get_wallet_direct
+
+    with LOCKS.setdefault(source, threading.Lock()):
+        snapshot = SNAPSHOTS.get(source)
+        if snapshot and snapshot["expires"] > time.monotonic():
+            metrics.inc(
+                "miner_cache_requests_total", cache="gateway", result="hit"
+            )
+            return snapshot
+        metrics.inc(
+            "miner_cache_requests_total", cache="gateway", result="miss"
+        )
+        ttl = params["cfg"]["gateway_ttl"]
+        try:
+            with metrics.timed("miner_fetch_seconds", source=source):
+                value, usd, price = get_wallet_direct(params, source)
+        # pylint: disable=broad-except
+        except (Exception, SystemExit) as exception:
+            metrics.inc(
+                "miner_upstream_errors_total",
+                source=source,
+                error=type(exception).__name__,
+            )
+            status, ttl = 502, min(ttl, ERROR_TTL)
+            data = {
+                "error": type(exception).__name__,
+                "message": str(exception),
+            }
+        else:
+            status = 200
+            data = {
+                "source": source,
+                "value": str(value),
+                "usd": str(usd),
+                "price": str(price) if price is not None else None,
+            }
+        etag = get_etag(data)
+        data["fetched"] = datetime.now().strftime(TS_FMT)
+        snapshot = {
+            "status": status,
+            "etag": etag,
+            "body": json.dumps(data).encode("utf-8"),
+            "expires": time.monotonic() + ttl,
+        }
+        SNAPSHOTS[source] = snapshot
+        metrics.save("gateway")
+        return snapshot
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Wallets of the miners"""
+
+    params = {}
+
+    # pylint: disable=invalid-name
+    def do_GET(self):
+        """Answer a wallet"""
+        # pylint: disable=import-outside-toplevel
+        from fetch import SOURCES
+
+        source = self.path.rstrip("/").split("/")[-1]
+        if not self.path.startswith("/wallet/") or source not in SOURCES:
+            self.send_error(404)
+            return
+        snapshot = get_snapshot(self.params, source)
+        max_age = max(int(snapshot["expires"] - time.monotonic()), 0)
+        if self.headers.get("If-None-Match") == snapshot["etag"]:
+            self.send_response(304)
+            self.send_header("ETag", snapshot["etag"])
+            self.send_header("Cache-Control", f"max-age={max_age}")
+            self.end_headers()
+            return
+        self.send_response(snapshot["status"])
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(snapshot["body"])))
+        self.send_header("ETag", snapshot["etag"])
+        self.send_header("Cache-Control", f"max-age={max_age}")
+        self.end_headers()
+        self.wfile.write(snapshot["body"])
+
+
+def get_wallet(url, source):
+    """Get the data of the source from the gateway (value, usd, price)"""
+    headers = {}
+    if source in ETAGS:
+        headers["If-None-Match"] = ETAGS[source][0]
+    response = SESSION.get(
+        f"{url}/wallet/{source}", headers=headers, timeout=60
+    )
+    if response.status_code == 304:
+        return ETAGS[source][1]
+    data = response.json()
+    if "error" in data:
+        if data["error"] == "MaintenanceMode":
+            # pylint: disable=import-outside-toplevel
+            from mining.cryptoatcost import MaintenanceMode
+
+            raise MaintenanceMode
+        raise GatewayError(f"{source}: {data['error']} {data['message']}")
+    price = data.get("price")
+    wallet = (
+        to_decimal(data["value"]),
+        to_decimal(data["usd"]),
+        to_decimal(price) if price is not None else None,
+    )
+    ETAGS[source] = (response.headers["ETag"], wallet)
+    return wallet
+
+
+def serve(cfg):
+    """Run the gateway on localhost"""
+    Handler.params = {"cfg": cfg, "hostname": cfg["hostname"]}
+    server = ThreadingHTTPServer(("127.0.0.1", cfg["gateway_port"]), Handler)
+    print(f"Gateway on http://127.0.0.1:{cfg['gateway_port']}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    # pylint: disable=import-outside-toplevel
+    from config import get_config
+
+    serve(get_config())
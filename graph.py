@@ -1,15 +1,23 @@
 #!/usr/bin/python3
 """ graph.py - display information as a graph
-    v0.0.5 - 2022-05-23 - nelbren@nelbren.com"""
+    v0.0.13 - 2026-10-19 - nelbren@nelbren.com"""
 import os
 from pathlib import Path
 import datetime
+import functools
 import sqlite3
+from flask import Response
 import dash
 import dash_bootstrap_components as dbc
 from dash import dcc, html, dash_table
 from dash.dependencies import Input, Output
 import pandas as pd
+import archive
+import cadence
+import metrics
+import prices
+from database import db, Unpaid, Delta, Rollup, Stat, Price, migrate
+from units import VALUE_PLACES, USD_PLACES, PRICE_PLACES
 
 HOME = str(Path.home())
 PWD = os.path.dirname(os.path.realpath(__file__))
@@ -18,18 +26,87 @@ BASE = f"{HOME}/.{PWD_DIR}.db"
 TS_FMT = "%Y-%m-%d %H:%M:%S"
 
 conn = sqlite3.connect(BASE, check_same_thread=False)
+# The tables of the newer versions, empty until preview.py backfills them
+db.create_tables([Unpaid, Delta, Rollup, Stat, Price], safe=True)
+migrate()
 c = conn.cursor()
 DATAFRAME = None
 EACH_HOURS = 4
+CACHE = {"version": None, "dataframe": None, "archived": None}
+COLUMNS = [
+    "source",
+    "currency",
+    "timestamp",
+    "usd",
+    "±usd",
+    "value",
+    "±value",
+]
+ARCHIVED = {"±usd": "delta_usd", "±value": "delta_value"}  # In archive.py
+
+
+def get_version():
+    """Version of the data, it changes with each new or deleted row"""
+    return conn.execute(
+        "SELECT min(id), max(id), (SELECT max(id) FROM delta), "
+        "(SELECT max(id) FROM price) FROM unpaid"
+    ).fetchone()
+
+
+def get_archived():
+    """Archived unpaids, only the rows archived since the last read are
+    loaded (the archive only gets rows newer than the ones it has)"""
+    old = CACHE["archived"]
+    after = None
+    if old is not None and not old.empty:
+        after = old.groupby("source", observed=True)["timestamp"].max()
+        after = after.to_dict()
+    table = archive.read(
+        [ARCHIVED.get(column, column) for column in COLUMNS], after=after
+    )
+    if table is None:
+        return old
+    new = table.to_pandas()
+    new.columns = COLUMNS
+    new["source"] = new["source"].astype(str)  # Not the partition category
+    if old is not None:
+        new = pd.concat([old, new], ignore_index=True)
+    CACHE["archived"] = new
+    return new
 
 
 def get_new_data():
-    """Updates the global variable 'DATAFRAME' with new data"""
+    """Data of the unpaids, read again only when it changes"""
+    version = get_version()
+    if CACHE["version"] == version:
+        metrics.inc(
+            "miner_cache_requests_total", cache="dataframe", result="hit"
+        )
+        return CACHE["dataframe"]
+    metrics.inc("miner_cache_requests_total", cache="dataframe", result="miss")
     # print(datetime.datetime.now(), "get_new_data - begin")
-    dataframe = pd.read_sql("SELECT * FROM unpaid", conn)
-    dataframe = dataframe[["source", "currency", "timestamp", "usd", "value"]]
+    dataframe = pd.read_sql(  # The base units to floats, only to display
+        "SELECT unpaid.source, unpaid.currency, unpaid.timestamp, "
+        f"unpaid.usd / 1e{USD_PLACES} AS usd, "
+        f'delta.usd / 1e{USD_PLACES} AS "±usd", '
+        f"unpaid.value / 1e{VALUE_PLACES} AS value, "
+        f'delta.value / 1e{VALUE_PLACES} AS "±value" '
+        "FROM unpaid LEFT JOIN delta ON delta.unpaid_id = unpaid.id",
+        conn,
+    )
+    dataframe = dataframe[COLUMNS]
+    old = get_archived()
+    if old is not None:  # Older history, memory-mapped
+        dataframe = pd.concat([old, dataframe], ignore_index=True)
+    ticks = pd.read_sql(
+        f"SELECT currency, timestamp, usd / 1e{PRICE_PLACES} AS price "
+        "FROM price",
+        conn,
+    )
+    dataframe = prices.revalue(dataframe, ticks)  # Price of the time, usd now
     dataframe.head(1)
     # print(datetime.datetime.now(), "get_new_data - end")
+    CACHE["version"], CACHE["dataframe"] = version, dataframe
     return dataframe
 
 
@@ -129,6 +206,69 @@ app.config.suppress_callback_exceptions = True
 app.layout = make_layout
 
 
+def timed_callback(function):
+    """Time the callback"""
+
+    @functools.wraps(function)
+    def wrapper(*args):
+        with metrics.timed(
+            "miner_callback_seconds", callback=function.__name__
+        ):
+            return function(*args)
+
+    return wrapper
+
+
+def get_db_metrics():
+    """Rows and size of the database, age of the last change of each
+    source and if it's stale (like the ✔/✖ of the title)"""
+    now = datetime.datetime.now().replace(microsecond=0)
+    tables = conn.execute(
+        "SELECT name FROM sqlite_master "
+        "WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+    ).fetchall()
+    data = {
+        "miner_db_size_bytes": [[{}, os.path.getsize(BASE)]],
+        "miner_db_rows": [
+            [
+                {"table": table},
+                conn.execute(f'SELECT count(*) FROM "{table}"').fetchone()[0],
+            ]
+            for (table,) in tables
+        ],
+        "miner_last_update_age_seconds": [],
+        "miner_last_seen_age_seconds": [],
+        "miner_observations": [],
+        "miner_stale": [],
+    }
+    rows = conn.execute(
+        "SELECT source, currency, timestamp, "
+        "coalesce(last_seen, timestamp), observations FROM unpaid "
+        "WHERE id IN (SELECT max(id) FROM unpaid GROUP BY source, currency)"
+    )
+    for source, currency, timestamp, seen, observations in rows.fetchall():
+        last = datetime.datetime.strptime(timestamp, TS_FMT)
+        seen = datetime.datetime.strptime(seen, TS_FMT)
+        labels = {"source": source, "currency": currency}
+        stale = cadence.is_stale(source, currency, seen, now)
+        age = (now - last).total_seconds()
+        data["miner_last_update_age_seconds"].append([labels, age])
+        age = (now - seen).total_seconds()
+        data["miner_last_seen_age_seconds"].append([labels, age])
+        data["miner_observations"].append([labels, observations])
+        data["miner_stale"].append([labels, int(stale)])
+    return data
+
+
+@server.route("/metrics")
+def metrics_page():
+    """Metrics of the dashboard, the database and the fetchers"""
+    text = metrics.render(
+        metrics.snapshot("graph"), get_db_metrics(), *metrics.load("graph")
+    )
+    return Response(text, mimetype="text/plain; version=0.0.4")
+
+
 def tabla(dataframe):
     """tabla"""
     return html.Div(
@@ -244,6 +384,7 @@ def graph_all(dataframe):
     [Input("interval-component", "n_intervals")],
 )
 # pylint: disable=unused-argument
+@timed_callback
 def update_text(n_intervals):
     """Update Text"""
     return get_timestamp()
@@ -255,6 +396,7 @@ def update_text(n_intervals):
     [Input("interval-component", "n_intervals")],
 )
 # pylint: disable=unused-argument
+@timed_callback
 def render_content(tab, n_intervals):
     """Render Content"""
     dataframe = get_new_data()
@@ -314,6 +456,7 @@ def split_filter_part(filter_part):
         Input("table-sorting-filtering", "filter_query"),
     ],
 )
+@timed_callback
 def update_table(page_current, page_size, sort_by, filter_query):
     """Update Table"""
     dataframe = get_new_data()
@@ -0,0 +1,166 @@
+#!/usr/bin/python3
+""" headless.py - data of the miners for scripts (json, ndjson, csv)
+    v0.0.6 - 2026-10-19 - nelbren@nelbren.com
+
+    Straight from the database (and the fetch with -u), without rich: the
+    last snapshot of each source and the history of the window with the
+    deltas of each row."""
+import sys
+import csv
+import json
+from datetime import datetime, timedelta
+from database import Unpaid
+from deltas_and_tags import query_unpaids, get_goals
+from rollup import WINDOWS
+from fetch import SOURCES
+import cadence
+import stats
+import prices
+
+TS_FMT = "%Y-%m-%d %H:%M:%S"
+FIELDS = [
+    "type",
+    "source",
+    "currency",
+    "id",
+    "work",
+    "step",
+    "timestamp",
+    "value",
+    "usd",
+    "delta_value",
+    "delta_usd",
+    "price",
+    "usd_now",
+    "last_seen",
+    "observations",
+    "stale",
+    "next_change",
+    "value_day",
+    "value_day_stdev",
+    "usd_day",
+    "eta",
+    "fetched",
+]
+
+
+def to_float(amount):
+    """Amount as a float for json, None stays"""
+    return float(amount) if amount is not None else None
+
+
+def get_row(kind, unpaid, ticks):
+    """Row of an unpaid and its deltas (the amounts as floats for json),
+    the price of its time and its usd at the last price"""
+    delta = getattr(unpaid, "delta", None)
+    has_delta = delta is not None and delta.id
+    last_price = ticks[1][-1] if ticks[1] else None
+    return {
+        "type": kind,
+        "source": unpaid.source,
+        "currency": unpaid.currency,
+        "id": unpaid.id,
+        "work": unpaid.work,
+        "step": unpaid.step,
+        "timestamp": unpaid.timestamp,
+        "value": float(unpaid.value),
+        "usd": float(unpaid.usd),
+        "delta_value": float(delta.value) if has_delta else None,
+        "delta_usd": float(delta.usd) if has_delta else None,
+        "price": to_float(prices.get_price_at(ticks, unpaid.timestamp)),
+        "usd_now": to_float(prices.usd_at(unpaid.value, last_price)),
+    }
+
+
+def get_rates(source, currency):
+    """Earning rates by day and ETA to the goal (USD, or the value)"""
+    stat = stats.get_stat(source, currency)
+    rates = {}
+    for field in ["value", "usd"]:
+        slope = stats.get_slope(stat, field)
+        rates[f"{field}_day"] = slope * 24 if slope is not None else None
+    stdev = stats.get_stdev(stat)
+    rates["value_day_stdev"] = stdev * 24 if stdev is not None else None
+    goal_usd, goal_val = get_goals(source)
+    if goal_usd:
+        eta = stats.get_eta(stat, "usd", goal_usd)
+    else:
+        eta = stats.get_eta(stat, "value", goal_val)
+    rates["eta"] = eta.strftime(TS_FMT) if eta else None
+    return rates
+
+
+def get_snapshot(source, currency, now, unpaid_save, ticks):
+    """Last unpaid of the source, None without data"""
+    unpaid = (
+        query_unpaids(source, currency)
+        .order_by(Unpaid.work.desc(), Unpaid.step.desc())
+        .first()
+    )
+    if unpaid is None:
+        return None
+    row = get_row("snapshot", unpaid, ticks)
+    last_seen = cadence.get_last_seen(unpaid)
+    row["last_seen"] = last_seen.strftime(TS_FMT)
+    row["observations"] = unpaid.observations
+    row["stale"] = cadence.is_stale(source, currency, last_seen, now)
+    change = cadence.get_next_change(source, currency)
+    row["next_change"] = change.strftime(TS_FMT) if change else None
+    row.update(get_rates(source, currency))
+    if source in unpaid_save:
+        fetched = unpaid_save[source]
+        row["fetched"] = (
+            fetched if isinstance(fetched, int) else type(fetched).__name__
+        )
+    return row
+
+
+def get_history(source, currency, last, params, ticks):
+    """Unpaids of the window (at most records, 0 = All), newest first"""
+    records, window = params["records"], params["chart"]
+    unpaids = query_unpaids(source, currency)
+    if WINDOWS[window]:
+        begin = last - timedelta(days=WINDOWS[window])
+        unpaids = unpaids.where(Unpaid.timestamp >= begin.strftime(TS_FMT))
+    unpaids = unpaids.order_by(Unpaid.work.desc(), Unpaid.step.desc())
+    if records > 0:
+        unpaids = unpaids.limit(records)
+    for unpaid in unpaids.iterator():
+        yield get_row("history", unpaid, ticks)
+
+
+def get_rows(params, unpaid_save=None):
+    """Snapshot of each source and, with records (-r), their history"""
+    unpaid_save = unpaid_save or {}
+    now = datetime.now().replace(microsecond=0)
+    for source, currency in SOURCES.items():
+        if not params[source]:
+            continue
+        ticks = prices.get_ticks(currency)
+        snapshot = get_snapshot(source, currency, now, unpaid_save, ticks)
+        if snapshot is None:
+            continue
+        yield snapshot
+        if params["records"] == -1:
+            continue
+        last = datetime.strptime(snapshot["timestamp"], TS_FMT)
+        yield from get_history(source, currency, last, params, ticks)
+
+
+def write(params, unpaid_save=None, file=None):
+    """Write the rows in the format of the params"""
+    file = file or sys.stdout
+    rows = get_rows(params, unpaid_save)
+    if params["format"] == "csv":
+        writer = csv.DictWriter(file, FIELDS, restval="")
+        writer.writeheader()
+        writer.writerows(rows)
+    elif params["format"] == "ndjson":
+        for row in rows:
+            file.write(json.dumps(row) + "\n")
+    else:
+        data = {"snapshot": [], "history": []}
+        for row in rows:
+            data[row.pop("type")].append(row)
+        json.dump(data, file, indent=2)
+        file.write("\n")
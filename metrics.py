@@ -0,0 +1,229 @@
+#!/usr/bin/python3
+""" metrics.py - counters, gauges and histograms in the Prometheus format
+    v0.0.3 - 2026-10-19 - nelbren@nelbren.com
+
+    Each process keeps its metrics in memory, the fetchers save them as a
+    snapshot next to the database and graph.py serves all of them (each
+    labeled with its process) in /metrics. A process adds its samples to
+    the last snapshot of its name, the runs of cron add up."""
+import os
+import sys
+import json
+import glob
+import time
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+
+HOME = str(Path.home())
+PWD = os.path.dirname(os.path.realpath(__file__))
+PWD_DIR = os.path.basename(PWD)
+BASE = f"{HOME}/.{PWD_DIR}.metrics"  # + .<process>.json
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)  # Seconds
+FAMILIES = {
+    # name: (type, help)
+    "miner_fetch_seconds": (
+        "histogram",
+        "Time to get the wallet of a source",
+    ),
+    "miner_upstream_errors_total": (
+        "counter",
+        "Failed fetches by source and error",
+    ),
+    "miner_last_success_timestamp_seconds": (
+        "gauge",
+        "Last time the wallet of a source was fetched",
+    ),
+    "miner_last_update_age_seconds": (
+        "gauge",
+        "Seconds since the last change saved of a source",
+    ),
+    "miner_last_seen_age_seconds": (
+        "gauge",
+        "Seconds since the last poll that got data of a source",
+    ),
+    "miner_observations": (
+        "gauge",
+        "Polls that read the last value of a source",
+    ),
+    "miner_stale": (
+        "gauge",
+        "1 when the last poll is older than expected (✖ in the title)",
+    ),
+    "miner_db_rows": ("gauge", "Rows of each table of the database"),
+    "miner_db_size_bytes": ("gauge", "Size of the database file"),
+    "miner_callback_seconds": ("histogram", "Time of the dash callbacks"),
+    "miner_cache_requests_total": (
+        "counter",
+        "Lookups of the caches by cache and result (hit/miss)",
+    ),
+}
+SAMPLES = {}  # name: {labels: value (histogram: buckets, sum, count)}
+STATE = {"mode": None, "merged": set()}  # Snapshots already added
+LOCK = threading.Lock()
+
+
+def get_key(labels):
+    """Key of the labels"""
+    return tuple(sorted(labels.items()))
+
+
+def inc(name, amount=1, **labels):
+    """Increment a counter"""
+    key = get_key(labels)
+    with LOCK:
+        samples = SAMPLES.setdefault(name, {})
+        samples[key] = samples.get(key, 0) + amount
+
+
+def set_gauge(name, value, **labels):
+    """Set a gauge"""
+    with LOCK:
+        SAMPLES.setdefault(name, {})[get_key(labels)] = value
+
+
+def observe(name, seconds, **labels):
+    """Add a value to a histogram"""
+    key = get_key(labels)
+    with LOCK:
+        histogram = SAMPLES.setdefault(name, {}).setdefault(
+            key, {"buckets": [0] * len(BUCKETS), "sum": 0.0, "count": 0}
+        )
+        for index, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                histogram["buckets"][index] += 1
+        histogram["sum"] += seconds
+        histogram["count"] += 1
+
+
+@contextmanager
+def timed(name, **labels):
+    """Observe the time of the block (also when it fails)"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start, **labels)
+
+
+def set_mode(mode):
+    """Mode of the script (update, daemon...), one snapshot by mode"""
+    STATE["mode"] = mode
+
+
+def get_process():
+    """Name of this process (preview-update, preview-daemon, gateway...)"""
+    script = os.path.splitext(os.path.basename(sys.argv[0]))[0] or "python"
+    return f"{script}-{STATE['mode']}" if STATE["mode"] else script
+
+
+def add_histogram(histogram, value):
+    """Add the buckets, sum and count of the value to the histogram"""
+    for index, count in enumerate(value["buckets"]):
+        histogram["buckets"][index] += count
+    histogram["sum"] += value["sum"]
+    histogram["count"] += value["count"]
+
+
+def merge(previous):
+    """Add the samples of a previous snapshot: the counters and histograms
+    add up, its gauges stay until this process sets them"""
+    with LOCK:
+        for name, samples in previous.items():
+            kind = FAMILIES.get(name, ("gauge", ""))[0]
+            current = SAMPLES.setdefault(name, {})
+            for labels, value in samples:
+                labels.pop("process", None)
+                key = get_key(labels)
+                if key not in current:
+                    current[key] = value
+                elif kind == "counter":
+                    current[key] += value
+                elif kind == "histogram":
+                    add_histogram(current[key], value)
+
+
+def snapshot(process=None):
+    """Copy of the samples labeled with the process"""
+    process = process or get_process()
+    with LOCK:
+        return {
+            name: [
+                [dict(key, process=process), json.loads(json.dumps(value))]
+                for key, value in samples.items()
+            ]
+            for name, samples in SAMPLES.items()
+        }
+
+
+def save(process=None):
+    """Save the snapshot for the dashboard server"""
+    process = process or get_process()
+    path = f"{BASE}.{process}.json"
+    if path not in STATE["merged"]:  # Once, the first save of the process
+        STATE["merged"].add(path)
+        try:
+            with open(path, encoding="utf-8") as _file:
+                merge(json.load(_file))
+        except (OSError, ValueError):
+            pass  # The first run
+    with open(path + ".tmp", "w", encoding="utf-8") as _file:
+        json.dump(snapshot(process), _file)
+    os.replace(path + ".tmp", path)
+
+
+def load(skip=None):
+    """Snapshots saved by the other processes"""
+    snapshots = []
+    for path in sorted(glob.glob(f"{BASE}.*.json")):
+        if path == f"{BASE}.{skip}.json":
+            continue
+        try:
+            with open(path, encoding="utf-8") as _file:
+                snapshots.append(json.load(_file))
+        except (OSError, ValueError):
+            continue  # Being replaced
+    return snapshots
+
+
+def get_labels(labels, **extra):
+    """Labels in the Prometheus format"""
+    labels = dict(labels, **extra)
+    if not labels:
+        return ""
+    items = []
+    for label, value in sorted(labels.items()):
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"')
+        items.append(f'{label}="{value}"')
+    return "{" + ",".join(items) + "}"
+
+
+def get_lines(name, kind, labels, value):
+    """Lines of a sample"""
+    if kind != "histogram":
+        return [f"{name}{get_labels(labels)} {value}"]
+    lines = [
+        f"{name}_bucket{get_labels(labels, le=bound)} {count}"
+        for bound, count in zip(BUCKETS, value["buckets"])
+    ]
+    inf = get_labels(labels, le="+Inf")
+    lines.append(f"{name}_bucket{inf} {value['count']}")
+    lines.append(f"{name}_sum{get_labels(labels)} {value['sum']}")
+    lines.append(f"{name}_count{get_labels(labels)} {value['count']}")
+    return lines
+
+
+def render(*snapshots):
+    """Text of the snapshots for /metrics"""
+    lines = []
+    for name, (kind, text) in FAMILIES.items():
+        samples = [
+            sample for data in snapshots for sample in data.get(name, [])
+        ]
+        if not samples:
+            continue
+        lines.append(f"# HELP {name} {text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            lines.extend(get_lines(name, kind, labels, value))
+    return "\n".join(lines) + "\n"
@@ -1,28 +1,30 @@
 #!/usr/bin/python3
 """ mining_at_cryptoatcost.py - get information from cryptoatcost.com
-    v0.2.0 - 2022-05-07 - nelbren@nelbren.com
+    v0.2.4 - 2026-10-19 - nelbren@nelbren.com
     NOTE: 2FA code thanks to Isonium """
 import re
 import os
 import sys
 import pickle
 import tempfile
-import requests
 import pyotp
 import inspect
+from decimal import InvalidOperation
 
 WD = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
 PD = os.path.dirname(WD)
 sys.path.insert(0, PD)
 
 from config import get_config
+from mining.resilience import ResilientSession, UpstreamError
+from units import to_decimal
 
 # import ipdb; ipdb.set_trace()
 # import logging; logging.basicConfig(level=logging.DEBUG)
 
 
-class Error(Exception):
-    """Base class for other exceptions"""
+class Error(UpstreamError):
+    """Base class for other exceptions (a failure of this source only)"""
 
 
 class CantGetCsrf(Error):
@@ -119,10 +121,7 @@ class CACPanel:
             pickle.dump(self.session.cookies, _file)
         page = self.session.get(self.url_base)
         if self.code_2fa:
-            try:
-                page = self.auth_2fa(page)
-            except MissingAuth2FA:
-                sys.exit(4)
+            page = self.auth_2fa(page)
         reg = r">(Miners)<"
         match = re.findall(reg, page.content.decode("utf-8"))
         self.logged = match
@@ -165,7 +164,8 @@ class CACPanel:
         self.username = cfg["username"]
         self.password = cfg["password"]
         self.code_2fa = cfg["code_2fa"]
-        self.session = requests.session()
+        self.session = ResilientSession()
+        self.price = None  # Without a price call, the usd is in the page
         self.cookie = (
             tempfile.gettempdir() + "/" + self.cookie + "_" + self.username
         )
@@ -176,9 +176,9 @@ class CACPanel:
                 self.session.cookies.update(pickle.load(_file))
             try:
                 page = self.session.get(self.url_base)
-            except requests.exceptions.ConnectionError:
+            except UpstreamError:
                 print(f"Connection problem to {self.url_base}!", flush=True)
-                sys.exit(2)
+                raise
             reg = r">(Miners)<"
             match = re.findall(reg, page.content.decode("utf-8"))
             self.logged = match
@@ -210,12 +210,12 @@ class CACPanel:
                 flush=True,
             )
         debug(parse)
-        if parse:
-            _btc = float(parse[0][0])
-            _usd = float(parse[0][1])
-        else:
+        try:
+            _btc = to_decimal(parse[0][0])
+            _usd = to_decimal(parse[0][1])
+        except (IndexError, InvalidOperation):
             print(f"{TAG[0]} Can't get crypto info", flush=True)
-            raise CantGetUSDandBTC
+            raise CantGetUSDandBTC from None
         return _btc, _usd
 
 
@@ -228,9 +228,13 @@ if __name__ == "__main__":
         btc, usd = cacpanel.wallet()
     except CantGetCsrf:
         sys.exit(3)
+    except MissingAuth2FA:
+        sys.exit(4)
     except CantGetUSDandBTC:
         sys.exit(5)
     except MaintenanceMode:
         sys.exit(6)
+    except UpstreamError:  # After its subclasses
+        sys.exit(2)
     else:
         print(f"BTC: {btc:1.8f} USD: {usd:05.2f}", flush=True)
@@ -1,9 +1,8 @@
 #!/usr/bin/python3
 """ ethermine.py - get information from ethermine.org
-    v0.0.6 - 2022-05-07 - nelbren@nelbren.com """
+    v0.0.10 - 2026-10-19 - nelbren@nelbren.com """
 import os
 import sys
-import requests
 import inspect
 
 WD = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
@@ -11,9 +10,11 @@ PD = os.path.dirname(WD)
 sys.path.insert(0, PD)
 
 from config import get_config
+from mining.resilience import ResilientSession, UpstreamError, read_json
+from units import WEI_PLACES, get_usd, from_units
 
 
-class Error(Exception):
+class Error(UpstreamError):
     """Base class for other exceptions"""
 
 
@@ -29,8 +30,11 @@ class ETMPanel:
     def get_price(self):
         """Price"""
         url = self.url_base + "/poolStats"
-        json = requests.get(url).json()
-        return json["data"]["price"]["usd"]
+        json = read_json(self.session.get(url))
+        try:
+            return json["data"]["price"]["usd"]
+        except (KeyError, TypeError) as exception:  # "data": "NO DATA"
+            raise CantGetUSDandETH(f"price: {exception}") from exception
 
     def wallet(self):
         """Get Miner information"""
@@ -39,17 +43,19 @@ class ETMPanel:
             # print(f"{TAG[0]} Can't get crypto info")
             # raise CantGetUSDandETH
         url = self.url_base + f"/miner/{self.address}/currentStats"
-        json = requests.get(url).json()
-        unpaid = json["data"]["unpaid"]
-        unpaid_eth = unpaid / 1000000000000000000
-        price = self.get_price()
-        unpaid_usd = round(unpaid_eth * price, 2)
-        unpaid_eth = float(f"{unpaid_eth:0.8f}")
-        return unpaid_eth, unpaid_usd
+        json = read_json(self.session.get(url))
+        try:
+            unpaid_eth = from_units(json["data"]["unpaid"], WEI_PLACES)
+        except (KeyError, TypeError) as exception:
+            raise CantGetUSDandETH(f"unpaid: {exception}") from exception
+        self.price = self.get_price()
+        return unpaid_eth, get_usd(unpaid_eth, self.price)
 
     def __init__(self):
         cfg = get_config()
         self.address = cfg["address"]
+        self.session = ResilientSession()
+        self.price = None  # Of the last wallet
 
 
 TAG = ["✖", "✔"]
@@ -58,7 +64,7 @@ if __name__ == "__main__":
     etmpanel = ETMPanel()
     try:
         eth, usd = etmpanel.wallet()
-    except CantGetUSDandETH:
+    except UpstreamError:  # CantGetUSDandETH too
         sys.exit(1)
     else:
         print(f"ETH: {eth:1.8f} USD: {usd:05.2f}")
@@ -1,9 +1,8 @@
 #!/usr/bin/python3
 """ mining_at_ethermine.py - get information from nicehash.com
-    v0.0.3 - 2022-05-09 - nelbren@nelbren.com """
+    v0.0.7 - 2026-10-19 - nelbren@nelbren.com """
 import os
 import sys
-import requests
 import uuid
 import hmac
 import math
@@ -18,12 +17,18 @@ PD = os.path.dirname(WD)
 sys.path.insert(0, PD)
 
 from config import get_config
+from mining.resilience import ResilientSession, UpstreamError, read_json
+from units import to_decimal, get_usd
 
 
-class Error(Exception):
+class Error(UpstreamError):
     """Base class for other exceptions"""
 
 
+class RequestFailed(Error):
+    """Raised when the API refuses the request (4xx)"""
+
+
 class CantGetUSDandBTC(Error):
     """Raised when Can't get usd and btc"""
 
@@ -79,9 +84,6 @@ class NCHPanel:
             "X-Request-Id": str(uuid.uuid4()),
         }
 
-        s = requests.Session()
-        s.headers = headers
-
         url = self.host + path
         if query:
             url += "?" + query
@@ -90,14 +92,16 @@ class NCHPanel:
             print(method, url)
 
         if body:
-            response = s.request(method, url, data=body_json)
+            response = self.session.request(
+                method, url, data=body_json, headers=headers
+            )
         else:
-            response = s.request(method, url)
+            response = self.session.request(method, url, headers=headers)
 
         if response.status_code == 200:
-            return response.json()
+            return read_json(response)
         elif response.content:
-            raise Exception(
+            raise RequestFailed(
                 str(response.status_code)
                 + ": "
                 + response.reason
@@ -105,7 +109,9 @@ class NCHPanel:
                 + str(response.content)
             )
         else:
-            raise Exception(str(response.status_code) + ": " + response.reason)
+            raise RequestFailed(
+                str(response.status_code) + ": " + response.reason
+            )
 
     def get_accounts_for_currency(self, currency):
         return self.request(
@@ -156,18 +162,16 @@ class NCHPanel:
         # unpaid_eth = unpaid / 1000000000000000000
         # unpaid_usd = round(unpaid_eth * price, 2)
         # unpaid_eth = float(f"{unpaid_eth:0.8f}")
-        price = self.get_price()
-        pending_btc = float(self.unpaid())
-        pending_usd = round(pending_btc * price, 2)
+        price = self.price = self.get_price()
+        pending_btc = to_decimal(self.unpaid())
+        pending_usd = get_usd(pending_btc, price)
         next_payout = self.next_payout()
-        unpaid_btc = float(
+        unpaid_btc = to_decimal(
             self.get_accounts_for_currency("BTC")["totalBalance"]
         )
-        unpaid_usd = round(unpaid_btc * price, 2)
+        unpaid_usd = get_usd(unpaid_btc, price)
         # return unpaid_btc, unpaid_usd, next_payout, pending_btc, pending_usd
-        unpaid_btc = f"{unpaid_btc:1.8f}"
-        unpaid_usd = f"{unpaid_usd:05.2f}"
-        return float(unpaid_btc), float(unpaid_usd)
+        return unpaid_btc, unpaid_usd
 
     def __init__(self):
         cfg = get_config()
@@ -175,6 +179,8 @@ class NCHPanel:
         self.key = cfg["nch_key"]
         self.secret = cfg["nch_secret"]
         self.verbose = False
+        self.session = ResilientSession()  # One for the breaker and bucket
+        self.price = None  # Of the last wallet
 
 
 TAG = ["✖", "✔"]
@@ -183,7 +189,7 @@ if __name__ == "__main__":
     nchpanel = NCHPanel()
     try:
         btc, usd = nchpanel.wallet()
-    except CantGetUSDandBTC:
+    except UpstreamError:  # CantGetUSDandBTC too
         sys.exit(1)
     else:
         print(f"BTC: {btc:1.8f} USD: {usd:05.2f}", flush=True)
@@ -0,0 +1,120 @@
+#!/usr/bin/python3
+""" replay.py - record and replay the responses of the pools
+    v0.0.1 - 2026-10-19 - nelbren@nelbren.com
+
+    MINER_RECORD=dir saves every response as a fixture,
+    MINER_REPLAY=dir answers from the fixtures (offline) waiting
+    MINER_REPLAY_LATENCY milliseconds by request.
+    Fixture: dir/<host>/<METHOD>_<path>.json -> {"status", "headers", "body"}
+"""
+import os
+import json
+import time
+import threading
+from collections import Counter
+from urllib.parse import urlparse
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+RECORD = os.environ.get("MINER_RECORD")
+REPLAY = os.environ.get("MINER_REPLAY")
+LATENCY = float(os.environ.get("MINER_REPLAY_LATENCY", "0")) / 1000
+COUNTS = Counter()  # Requests by host
+LOCK = threading.Lock()
+
+
+class MissingFixture(Exception):
+    """Raised when there is no fixture for the request"""
+
+
+def get_fixture(directory, method, url):
+    """Path of the fixture of the request"""
+    parsed = urlparse(url)
+    path = parsed.path.strip("/").replace("/", "_") or "index"
+    return f"{directory}/{parsed.hostname}/{method}_{path}.json"
+
+
+def count(url):
+    """Count the request of the host"""
+    with LOCK:
+        COUNTS[urlparse(url).hostname] += 1
+
+
+class ReplayAdapter(BaseAdapter):
+    """Answer the requests from the fixtures"""
+
+    def __init__(self, directory, latency=LATENCY):
+        super().__init__()
+        self.directory = directory
+        self.latency = latency
+
+    # pylint: disable=too-many-arguments,unused-argument
+    def send(
+        self,
+        request,
+        stream=False,
+        timeout=None,
+        verify=True,
+        cert=None,
+        proxies=None,
+    ):
+        fixture = get_fixture(self.directory, request.method, request.url)
+        if not os.path.exists(fixture):
+            raise MissingFixture(fixture)
+        with open(fixture, encoding="utf-8") as _file:
+            data = json.load(_file)
+        count(request.url)
+        time.sleep(self.latency)
+        response = Response()
+        response.status_code = data["status"]
+        response.reason = data.get("reason", "")
+        response.headers = CaseInsensitiveDict(data.get("headers", {}))
+        response.encoding = "utf-8"
+        # pylint: disable=protected-access
+        response._content = data["body"].encode("utf-8")
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+class RecordAdapter(HTTPAdapter):
+    """Save the responses as fixtures"""
+
+    def __init__(self, directory):
+        super().__init__()
+        self.directory = directory
+
+    # pylint: disable=arguments-differ
+    def send(self, request, *args, **kwargs):
+        response = super().send(request, *args, **kwargs)
+        count(request.url)
+        fixture = get_fixture(self.directory, request.method, request.url)
+        os.makedirs(os.path.dirname(fixture), exist_ok=True)
+        data = {
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {
+                "Content-Type": response.headers.get("Content-Type", "")
+            },
+            "body": response.text,
+        }
+        with open(fixture, "w", encoding="utf-8") as _file:
+            json.dump(data, _file, indent=2)
+        return response
+
+
+def mount(session):
+    """Replay or record the requests of the session when it's enabled"""
+    adapter = None
+    if REPLAY:
+        adapter = ReplayAdapter(REPLAY)
+    elif RECORD:
+        adapter = RecordAdapter(RECORD)
+    if adapter:
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+    return session
@@ -0,0 +1,166 @@
+#!/usr/bin/python3
+""" resilience.py - timeouts, rate limits and circuit breakers by host
+    v0.0.4 - 2026-10-19 - nelbren@nelbren.com """
+import time
+import threading
+from collections import Counter
+from urllib.parse import urlparse
+import requests
+from mining import replay
+
+# (connect, read) seconds
+TIMEOUTS = {
+    "api.ethermine.org": (5, 20),
+    "api2.nicehash.com": (5, 20),
+    "wallet.cryptoatcost.com": (5, 30),
+}
+TIMEOUT = (5, 30)
+RATE = 0.5  # Requests by second, after a burst of CAPACITY
+CAPACITY = 10
+FAILURES = 3  # Consecutive failures to open the circuit
+COOLDOWN = 300  # Seconds to skip a failing host
+RETRIES = 3  # Retry budget by host, one more each RETRY_EVERY seconds
+RETRY_EVERY = 60
+LOCK = threading.Lock()
+BUCKETS = {}
+BREAKERS = {}
+BUDGETS = {}
+COUNTS = Counter()  # Requests sent by host
+
+
+class UpstreamError(Exception):
+    """Base class of the errors talking with a pool"""
+
+
+class UpstreamTimeout(UpstreamError):
+    """Raised when the pool doesn't answer in time"""
+
+
+class UpstreamUnavailable(UpstreamError):
+    """Raised when the pool can't be reached or fails (5xx, 429)"""
+
+
+class RateLimited(UpstreamError):
+    """Raised when there are no tokens left for the host"""
+
+
+class CircuitOpen(UpstreamError):
+    """Raised when the host is skipped after failing"""
+
+
+class UpstreamInvalid(UpstreamError):
+    """Raised when the answer of the pool can't be read"""
+
+
+def read_json(response):
+    """Data of a JSON answer, UpstreamInvalid when it isn't JSON"""
+    try:
+        return response.json()
+    except ValueError as exception:  # JSONDecodeError too
+        host = urlparse(response.url).hostname
+        raise UpstreamInvalid(f"{host}: {exception}") from exception
+
+
+class TokenBucket:
+    """Tokens refilled at rate by second, up to capacity"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def take(self):
+        """Take a token if there is one"""
+        with LOCK:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+class CircuitBreaker:
+    """Open after some consecutive failures, a trial after the cooldown"""
+
+    def __init__(self, failures=FAILURES, cooldown=COOLDOWN):
+        self.failures = failures
+        self.cooldown = cooldown
+        self.count = 0
+        self.opened = None
+
+    def check(self, host):
+        """Raise CircuitOpen while the host is cooling down"""
+        with LOCK:
+            if self.opened is None:
+                return
+            left = self.cooldown - (time.monotonic() - self.opened)
+            if left > 0:
+                raise CircuitOpen(f"{host}: skipped for {left:.0f}s")
+            self.opened = None  # Half-open: one more failure opens it
+            self.count = self.failures - 1
+
+    def success(self):
+        """Close the circuit"""
+        with LOCK:
+            self.count, self.opened = 0, None
+
+    def failure(self):
+        """Count a failure, open the circuit after too many"""
+        with LOCK:
+            self.count += 1
+            if self.count >= self.failures:
+                self.opened = time.monotonic()
+
+
+def get_state(host):
+    """Bucket, breaker and retry budget of the host"""
+    with LOCK:
+        if host not in BREAKERS:
+            BUCKETS[host] = TokenBucket(RATE, CAPACITY)
+            BREAKERS[host] = CircuitBreaker()
+            BUDGETS[host] = TokenBucket(1 / RETRY_EVERY, RETRIES)
+    return BUCKETS[host], BREAKERS[host], BUDGETS[host]
+
+
+class ResilientSession(requests.Session):
+    """Session with a timeout, a rate limit and a circuit breaker by host,
+    the GETs are retried once while the budget of the host allows it"""
+
+    def __init__(self):
+        super().__init__()
+        replay.mount(self)  # Offline with MINER_REPLAY
+
+    # pylint: disable=arguments-differ
+    def request(self, method, url, *args, **kwargs):
+        host = urlparse(url).hostname
+        bucket, breaker, budget = get_state(host)
+        kwargs.setdefault("timeout", TIMEOUTS.get(host, TIMEOUT))
+        retry = method.upper() == "GET"
+        while True:
+            breaker.check(host)
+            if not bucket.take():
+                raise RateLimited(f"{host}: too many requests")
+            with LOCK:
+                COUNTS[host] += 1
+            try:
+                response = super().request(method, url, *args, **kwargs)
+            except requests.Timeout as exception:
+                error = UpstreamTimeout(f"{host}: {exception}")
+            except requests.ConnectionError as exception:
+                error = UpstreamUnavailable(f"{host}: {exception}")
+            else:
+                if response.status_code < 500 and response.status_code != 429:
+                    breaker.success()
+                    return response
+                error = UpstreamUnavailable(
+                    f"{host}: {response.status_code} {response.reason}"
+                )
+            breaker.failure()
+            if not retry or not budget.take():
+                raise error
+            retry = False
@@ -0,0 +1,102 @@
+#!/usr/bin/python3
+""" notify.py - deliver the image by mail and telegram
+    v0.0.4 - 2026-10-19 - nelbren@nelbren.com"""
+import smtplib
+from concurrent.futures import ThreadPoolExecutor, wait
+from email.mime.application import MIMEApplication
+from email.mime.multipart import MIMEMultipart
+import requests
+from timing import span
+
+TELEGRAM = "https://api.telegram.org/bot"
+EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="notify")
+SESSION = requests.Session()  # Pooled connections to telegram
+
+
+def get_subject(numbers, tag):
+    """get_subject (the goal tags exist only for the sources with a GOAL,
+    the subject doesn't use them)"""
+    # pylint: disable=unused-argument
+    names = {"ethermine": "ETM", "cryptoatcost": "CAC", "nicehash": "NCH"}
+    parts = []
+    for mining, number in numbers.items():
+        if mining in names:
+            parts.append(
+                f"{names[mining]}⛏️💵{number['usd']}🏦{number['val']}"
+            )
+    return " ".join(parts)
+
+
+def get_status(next_update):
+    """Status line with the next update"""
+    msg = "✅"  # msg += '🔳'
+    numbers = ["0️⃣", "1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣"]
+    msg += numbers[1]
+    next_update_str = next_update["timestamp"]
+    msg += f"🔜{next_update_str}xBTC"
+    return msg
+
+
+def mail_data(cfg, name, image, subject):
+    """Send the image by mail"""
+    msg = MIMEMultipart()
+    msg["From"] = cfg["mail_from"]
+    msg["To"] = cfg["mail_to"]
+    msg["Subject"] = subject
+    part = MIMEApplication(image, Name=name)
+    part["Content-Decomposition"] = f"attachment, filename={name}"
+    msg.attach(part)
+
+    with span("notify.mail"), smtplib.SMTP("localhost") as smtp:
+        smtp.sendmail(msg["From"], msg["To"], msg.as_string())
+
+
+def telegram_data(cfg, name, image, caption):
+    """Send the image to telegram, the message goes as the caption"""
+    url = f"{TELEGRAM}{cfg['telegram_token']}/sendPhoto"
+    data = {"chat_id": cfg["telegram_id"], "caption": caption}
+    with span("notify.telegram"):
+        response = SESSION.post(
+            url, data=data, files={"photo": (name, image)}, timeout=60
+        )
+        response.raise_for_status()
+
+
+def deliver(params, numbers, tag, next_update, image):
+    """Send the image to every notifier in the background"""
+    if not params["mail"] and not params["telegram"]:
+        return []
+    cfg = params["cfg"]
+    name = params["name"] + ".jpg"
+    futures = []
+    if params["mail"]:
+        if not cfg["mail_from"] or not cfg["mail_to"]:
+            print("Please set the FROM and TO fields of MAIL!")
+        else:
+            subject = get_subject(numbers, tag)
+            futures.append(
+                EXECUTOR.submit(mail_data, cfg, name, image, subject)
+            )
+    if params["telegram"]:
+        if not cfg["telegram_token"] or not cfg["telegram_id"]:
+            print("Please set the TOKEN and ID fields of TELEGRAM!")
+        else:
+            subject = get_subject(numbers, tag)
+            caption = f"{subject}\n{get_status(next_update)}"
+            futures.append(
+                EXECUTOR.submit(telegram_data, cfg, name, image, caption)
+            )
+    return futures
+
+
+def show_error(future):
+    """Show the error of a delivery"""
+    if future.exception():
+        print(f"Can't deliver: {future.exception()}", flush=True)
+
+
+def wait_all(futures):
+    """Wait for the deliveries and show the errors"""
+    wait(futures)
+    for future in futures:
+        show_error(future)
@@ -0,0 +1,84 @@
+#!/usr/bin/python3
+""" prices.py - usd price of each coin as its own time series
+    v0.0.2 - 2026-10-19 - nelbren@nelbren.com
+
+    The panels with a price call give it on each fetch, only a change is a
+    new tick. The views join the unpaids with the ticks on read: the price
+    of the time of each unpaid and its usd at the last price (the history
+    revalued without asking the pools again)."""
+from bisect import bisect_right
+from database import Price
+from units import PRICE_PLACES, USD_PLACES, round_units
+
+TS_FMT = "%Y-%m-%d %H:%M:%S"
+
+
+def save_price(currency, price, timestamp):
+    """Add a tick when the price of the currency changes"""
+    price = round_units(price, PRICE_PLACES)
+    last = (
+        Price.select(Price.usd)
+        .where(Price.currency == currency)
+        .order_by(Price.timestamp.desc())
+        .first()
+    )
+    if last is not None and last.usd == price:
+        return False
+    Price.insert(
+        currency=currency, timestamp=timestamp, usd=price
+    ).on_conflict(
+        conflict_target=[Price.currency, Price.timestamp],
+        update={Price.usd: price},
+    ).execute()
+    return True
+
+
+def get_ticks(currency):
+    """Timestamps and prices of the currency, oldest first"""
+    ticks = (
+        Price.select(Price.timestamp, Price.usd)
+        .where(Price.currency == currency)
+        .order_by(Price.timestamp)
+    )
+    timestamps, usds = [], []
+    for tick in ticks:
+        timestamps.append(tick.timestamp)
+        usds.append(tick.usd)
+    return timestamps, usds
+
+
+def get_price_at(ticks, timestamp):
+    """Price of the time (the last tick before it), None before the first"""
+    timestamps, usds = ticks
+    item = bisect_right(timestamps, timestamp)
+    return usds[item - 1] if item else None
+
+
+def usd_at(value, price):
+    """Usd of the value at the price, None without price (units.get_usd
+    needs the price)"""
+    if price is None:
+        return None
+    return round_units(value * price, USD_PLACES)
+
+
+def revalue(dataframe, ticks):
+    """Add the price of the time and the usd at the last price to the
+    unpaids (pandas, joined by currency), NaN without ticks"""
+    # pylint: disable=import-outside-toplevel
+    import pandas as pd
+
+    if ticks.empty or dataframe.empty:
+        dataframe["price"] = dataframe["usd_now"] = float("nan")
+        return dataframe
+    ticks = ticks.assign(at=pd.to_datetime(ticks["timestamp"], format=TS_FMT))
+    ticks = ticks.drop(columns="timestamp").sort_values("at")
+    dataframe = dataframe.assign(
+        at=pd.to_datetime(dataframe["timestamp"], format=TS_FMT)
+    ).sort_values("at")
+    dataframe = pd.merge_asof(dataframe, ticks, on="at", by="currency")
+    last = ticks.groupby("currency")["price"].last()
+    dataframe["usd_now"] = (
+        dataframe["value"] * dataframe["currency"].map(last)
+    ).round(USD_PLACES)
+    return dataframe.drop(columns="at")
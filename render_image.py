@@ -0,0 +1,99 @@
+#!/usr/bin/python3
+""" render_image.py - draw the recorded console as an image
+    v0.0.1 - 2026-10-19 - nelbren@nelbren.com"""
+from io import BytesIO
+from functools import lru_cache
+from PIL import Image, ImageDraw, ImageFont
+from rich.cells import cell_len
+from rich.segment import Segment
+from rich.terminal_theme import DEFAULT_TERMINAL_THEME
+
+FONTS = {False: "DejaVuSansMono.ttf", True: "DejaVuSansMono-Bold.ttf"}
+FONT_SIZE = 41
+FOREGROUND = (255, 255, 255)
+BACKGROUND = (0, 0, 0)
+EMOJIS = ["⛏️", "🎯"]
+
+
+@lru_cache(maxsize=4)
+def get_fonts(size):
+    """Monospace fonts (normal and bold)"""
+    fonts = {}
+    for bold, name in FONTS.items():
+        try:
+            fonts[bold] = ImageFont.truetype(name, size)
+        except OSError:
+            fonts[bold] = ImageFont.load_default(size)
+    return fonts
+
+
+def narrow(text):
+    """Replace the wide characters (emojis) by spaces"""
+    if text.isascii():
+        return text
+    for emoji in EMOJIS:
+        text = text.replace(emoji, " " * cell_len(emoji))
+    return "".join(
+        char if cell_len(char) == 1 else " " * cell_len(char) for char in text
+    )
+
+
+def get_colors(style):
+    """Foreground, background and bold of a style"""
+    if style is None:
+        return FOREGROUND, BACKGROUND, False
+    color, bgcolor = FOREGROUND, BACKGROUND
+    if style.color is not None and not style.color.is_default:
+        color = style.color.get_truecolor(DEFAULT_TERMINAL_THEME)
+    if style.bgcolor is not None and not style.bgcolor.is_default:
+        bgcolor = style.bgcolor.get_truecolor(
+            DEFAULT_TERMINAL_THEME, foreground=False
+        )
+    if style.reverse:
+        color, bgcolor = bgcolor, color
+    return tuple(color), tuple(bgcolor), bool(style.bold)
+
+
+def get_lines(console):
+    """Lines of segments recorded by the console"""
+    # pylint: disable=protected-access
+    with console._record_buffer_lock:
+        segments = list(console._record_buffer)
+    segments = Segment.simplify(Segment.filter_control(segments))
+    return list(Segment.split_lines(segments))
+
+
+def draw_image(console, size=FONT_SIZE):
+    """Draw the recorded console"""
+    fonts = get_fonts(size)
+    lines = get_lines(console)
+    cell_width = round(fonts[False].getlength("M"))
+    ascent, descent = fonts[False].getmetrics()
+    cell_height = ascent + descent
+    image = Image.new(
+        "RGB",
+        (console.width * cell_width, max(len(lines), 1) * cell_height),
+        BACKGROUND,
+    )
+    draw = ImageDraw.Draw(image)
+    for row, line in enumerate(lines):
+        column, top = 0, row * cell_height
+        for text, style, _ in line:
+            text = narrow(text)
+            color, bgcolor, bold = get_colors(style)
+            left, width = column * cell_width, len(text) * cell_width
+            if bgcolor != BACKGROUND:
+                draw.rectangle(
+                    [left, top, left + width - 1, top + cell_height - 1],
+                    fill=bgcolor,
+                )
+            draw.text((left, top), text, font=fonts[bold], fill=color)
+            column += len(text)
+    return image
+
+
+def get_image(console, image_format="JPEG"):
+    """Image of the recorded console as bytes (JPEG or PNG)"""
+    buffer = BytesIO()
+    draw_image(console).save(buffer, format=image_format)
+    return buffer.getvalue()
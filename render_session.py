@@ -0,0 +1,77 @@
+#!/usr/bin/python3
+""" render_session.py - consoles of the renders and their recording
+    v0.0.2 - 2026-10-19 - nelbren@nelbren.com"""
+import re
+from rich.console import Console
+import render_image
+from timing import span
+
+
+def save_html(console, html):
+    """Save HTML"""
+    text = console.export_html(clear=False)
+    pre1 = "pre { color: #ffffff; background-color: #000000; "
+    pre2 = "font-size: 41px; }"
+    pre = pre1 + pre2
+    text = re.sub("</style>", f"{pre}\n</style>", text)
+    with open(html, "w", encoding="utf-8") as _file:
+        _file.write(text)
+
+
+class RenderSession:
+    """A console for each render, recording only when the image or the
+    HTML are exported, the recording is dropped after each export"""
+
+    def __init__(self, size_term, record=False, file=None, screen=None):
+        self.size_term = size_term
+        self.record = record
+        self.file = file
+        self.screen = screen  # Off-screen frames for the screen
+        self.console = None
+        self.exports = 0
+
+    def new_console(self, size_term=None):
+        """Console of the next render"""
+        if size_term:
+            self.size_term = size_term
+        if self.screen:
+            self.console = self.screen.console(self.size_term)
+        else:
+            self.console = Console(
+                record=self.record,
+                width=self.size_term["columns"],
+                file=self.file,
+            )
+        return self.console
+
+    def buffer_size(self):
+        """Segments kept by the recording"""
+        if self.console is None or not self.record:
+            return 0
+        # pylint: disable=protected-access
+        with self.console._record_buffer_lock:
+            return len(self.console._record_buffer)
+
+    def flush(self):
+        """Drop the recording"""
+        if self.console is None or not self.record:
+            return
+        # pylint: disable=protected-access
+        with self.console._record_buffer_lock:
+            del self.console._record_buffer[:]
+
+    def export(self, params):
+        """Image of the recording (JPG and HTML with save_dir)"""
+        if not self.record:
+            return None
+        with span("export.image"):
+            image = render_image.get_image(self.console)
+        if params["save_dir"]:
+            name = params["save_dir"] + "/" + params["name"]
+            with open(name + ".jpg", "wb") as _file:
+                _file.write(image)
+            with span("export.html"):
+                save_html(self.console, name + ".html")
+        self.exports += 1
+        self.flush()
+        return image
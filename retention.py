@@ -0,0 +1,159 @@
+#!/usr/bin/python3
+""" retention.py - prune the old history and give the space back
+    v0.0.1 - 2026-10-19 - nelbren@nelbren.com
+
+    The raw unpaids older than RAW_DAYS and the hourly rollups older than
+    HOUR_DAYS are deleted (the daily rollups stay forever, so the charts
+    keep all the history), the free pages go back to the disk with an
+    incremental vacuum. With --dry-run only the report is shown."""
+from datetime import datetime, timedelta
+import peewee
+from database import db, Unpaid, Delta, Rollup
+from rollup import backfill_rollups
+from archive import CHUNK, get_cutoff, delete_rows
+
+TS_FMT = "%Y-%m-%d %H:%M:%S"
+TABLES = {"unpaid": Unpaid, "delta": Delta, "rollup": Rollup}
+INCREMENTAL = 2  # PRAGMA auto_vacuum
+HOUR_DAYS = 30  # At least, the charts up to 30d use the hourly rollups
+
+
+def get_unpaid_ids(raw_days, now):
+    """Unpaids older than raw_days (the newest of each source stay)"""
+    ids = []
+    groups = Unpaid.select(Unpaid.source, Unpaid.currency).distinct()
+    for source, currency in groups.tuples():
+        cutoff = get_cutoff(source, currency, raw_days, now)
+        if cutoff is None:
+            continue
+        query = Unpaid.select(Unpaid.id).where(
+            (Unpaid.source == source)
+            & (Unpaid.currency == currency)
+            & (Unpaid.timestamp < cutoff)
+        )
+        ids.extend(unpaid_id for (unpaid_id,) in query.tuples())
+    return ids
+
+
+def get_hourly(hour_days, now):
+    """Condition of the hourly rollups older than hour_days"""
+    cutoff = (now - timedelta(days=hour_days)).strftime(TS_FMT)
+    return (Rollup.period == "hour") & (Rollup.bucket < cutoff)
+
+
+def count_deltas(ids):
+    """Deltas of the unpaids"""
+    return sum(
+        Delta.select()
+        .where(Delta.unpaid.in_(ids[item : item + CHUNK]))
+        .count()
+        for item in range(0, len(ids), CHUNK)
+    )
+
+
+def get_pragma(name):
+    """Value of a pragma"""
+    return db.execute_sql(f"PRAGMA {name}").fetchone()[0]
+
+
+def get_table_bytes():
+    """Bytes of each table with its indexes, None without dbstat"""
+    try:
+        rows = db.execute_sql(
+            "SELECT name, SUM(pgsize) FROM dbstat GROUP BY name"
+        ).fetchall()
+    except peewee.OperationalError:
+        return None
+    tables = dict(
+        db.execute_sql(
+            "SELECT name, tbl_name FROM sqlite_master "
+            "WHERE type IN ('table', 'index')"
+        ).fetchall()
+    )
+    sizes = {}
+    for name, size in rows:
+        table = tables.get(name, name)
+        sizes[table] = sizes.get(table, 0) + size
+    return sizes
+
+
+def get_reclaim(removed):
+    """Bytes to reclaim: the free pages and the share of the rows"""
+    page_size = get_pragma("page_size")
+    free = get_pragma("freelist_count")
+    reclaim = free * page_size
+    counts = {table: model.select().count() for table, model in TABLES.items()}
+    sizes = get_table_bytes()
+    if sizes is None:  # Every row weighs the same
+        used = (get_pragma("page_count") - free) * page_size
+        by_row = used / max(sum(counts.values()), 1)
+        return int(reclaim + by_row * sum(removed.values()))
+    for table, count in counts.items():
+        if count:
+            reclaim += sizes.get(table, 0) * removed[table] / count
+    return int(reclaim)
+
+
+def compact(cfg, dry_run=False, now=None):
+    """Apply the retention of the config, returns the rows deleted (or to
+    delete) by table and the bytes reclaimed (or estimated)"""
+    now = now or datetime.now()
+    raw_days = cfg["retention_raw_days"]
+    hour_days = cfg["retention_hour_days"]
+    ids = get_unpaid_ids(raw_days, now) if raw_days else []
+    hourly = None
+    if hour_days:
+        hourly = get_hourly(max(hour_days, HOUR_DAYS), now)
+    removed = {
+        "unpaid": len(ids),
+        "delta": count_deltas(ids),
+        "rollup": (
+            Rollup.select().where(hourly).count() if hourly is not None else 0
+        ),
+    }
+    if dry_run:
+        return removed, get_reclaim(removed)
+    pages = get_pragma("page_count")
+    backfill_rollups()  # Every unpaid is folded in the rollups first
+    delete_rows(ids)
+    if hourly is not None:
+        Rollup.delete().where(hourly).execute()
+    vacuum()
+    pages -= get_pragma("page_count")
+    return removed, pages * get_pragma("page_size")
+
+
+def vacuum():
+    """Give the free pages back (the first time a full VACUUM turns on the
+    incremental mode of an old database)"""
+    if get_pragma("auto_vacuum") != INCREMENTAL:
+        db.execute_sql(f"PRAGMA auto_vacuum = {INCREMENTAL}")
+        db.execute_sql("VACUUM")
+    else:
+        # executescript steps until the end, execute frees only one page
+        db.connection().executescript("PRAGMA incremental_vacuum;")
+
+
+def get_message(removed, size, dry_run):
+    """Message of the report"""
+    rows = ", ".join(f"{table} {count}" for table, count in removed.items())
+    verb = "would reclaim" if dry_run else "reclaimed"
+    return f"deleted rows: {rows}, {verb} {size / 1024:.1f} KiB"
+
+
+if __name__ == "__main__":
+    # pylint: disable=import-outside-toplevel
+    import argparse
+    from config import get_config
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        default=False,
+        dest="dry_run",
+        help="Only show the rows and the space to reclaim",
+    )
+    args = parser.parse_args()
+    db.connect()
+    print(get_message(*compact(get_config(), args.dry_run), args.dry_run))
@@ -0,0 +1,138 @@
+#!/usr/bin/python3
+""" rollup.py - aggregate unpaids by hour and by day
+    v0.0.4 - 2026-10-19 - nelbren@nelbren.com"""
+from datetime import datetime, timedelta
+from peewee import fn
+from database import db, Unpaid, Rollup
+
+TS_FMT = "%Y-%m-%d %H:%M:%S"
+PERIODS = {"hour": (13, ":00:00"), "day": (10, " 00:00:00")}
+WINDOWS = {"1d": 1, "7d": 7, "30d": 30, "all": 0}
+
+
+def get_bucket(timestamp, period):
+    """Timestamp of the beginning of the period"""
+    size, rest = PERIODS[period]
+    return timestamp[:size] + rest
+
+
+def save_rollups(unpaid):
+    """Add a new unpaid to the rollups (floats, only for the charts)"""
+    value, usd = float(unpaid.value), float(unpaid.usd)
+    for period in PERIODS:
+        Rollup.insert(
+            source=unpaid.source,
+            currency=unpaid.currency,
+            period=period,
+            bucket=get_bucket(unpaid.timestamp, period),
+            value=value,
+            usd=usd,
+            value_min=value,
+            value_max=value,
+            count=1,
+        ).on_conflict(
+            conflict_target=[
+                Rollup.source,
+                Rollup.currency,
+                Rollup.period,
+                Rollup.bucket,
+            ],
+            update={
+                Rollup.value: value,
+                Rollup.usd: usd,
+                Rollup.value_min: fn.MIN(Rollup.value_min, value),
+                Rollup.value_max: fn.MAX(Rollup.value_max, value),
+                Rollup.count: Rollup.count + 1,
+            },
+        ).execute()
+
+
+def backfill_rollups():
+    """Rebuild the rollups if some unpaids are missing in them (after an
+    archive or a retention the rollups keep more unpaids than the database,
+    the daily ones are never pruned)"""
+    rolled = (
+        Rollup.select(fn.SUM(Rollup.count))
+        .where(Rollup.period == "day")
+        .scalar()
+    )
+    if (rolled or 0) >= Unpaid.select().count():
+        return
+    rollups = {}
+    for unpaid in Unpaid.select().order_by(Unpaid.id):
+        value, usd = float(unpaid.value), float(unpaid.usd)
+        for period in PERIODS:
+            key = (
+                unpaid.source,
+                unpaid.currency,
+                period,
+                get_bucket(unpaid.timestamp, period),
+            )
+            if key not in rollups:
+                rollups[key] = {
+                    "source": key[0],
+                    "currency": key[1],
+                    "period": key[2],
+                    "bucket": key[3],
+                    "value_min": value,
+                    "value_max": value,
+                    "count": 0,
+                }
+            rollup = rollups[key]
+            rollup["value"], rollup["usd"] = value, usd
+            rollup["value_min"] = min(rollup["value_min"], value)
+            rollup["value_max"] = max(rollup["value_max"], value)
+            rollup["count"] += 1
+    rows = list(rollups.values())
+    with db.atomic():
+        Rollup.delete().execute()
+        for item in range(0, len(rows), 100):
+            Rollup.insert_many(rows[item : item + 100]).execute()
+
+
+def get_buckets(source, currency, window, buckets):
+    """Last value and usd of each bucket in the window"""
+    last = (
+        Rollup.select(fn.MAX(Rollup.bucket))
+        .where(
+            (Rollup.source == source)
+            & (Rollup.currency == currency)
+            & (Rollup.period == "hour")
+        )
+        .scalar()
+    )
+    if last is None:
+        return [], [], []
+    end = datetime.strptime(last, TS_FMT) + timedelta(hours=1)
+    if WINDOWS[window]:
+        begin = end - timedelta(days=WINDOWS[window])
+    else:
+        first = (
+            Rollup.select(fn.MIN(Rollup.bucket))
+            .where((Rollup.source == source) & (Rollup.currency == currency))
+            .scalar()
+        )
+        begin = datetime.strptime(first, TS_FMT)
+    size = (end - begin) / buckets
+    period = "day" if size >= timedelta(days=1) else "hour"
+    rollups = (
+        Rollup.select(Rollup.bucket, Rollup.value, Rollup.usd)
+        .where(
+            (Rollup.source == source)
+            & (Rollup.currency == currency)
+            & (Rollup.period == period)
+            & (Rollup.bucket >= begin.strftime(TS_FMT))
+        )
+        .order_by(Rollup.bucket)
+        .tuples()
+    )
+    last_buckets = {}
+    for bucket, value, usd in rollups:
+        item = int((datetime.strptime(bucket, TS_FMT) - begin) / size)
+        last_buckets[item] = (value, usd)
+    timestamps, values, usds = [], [], []
+    for item, (value, usd) in sorted(last_buckets.items()):
+        timestamps.append((begin + item * size).strftime(TS_FMT))
+        values.append(value)
+        usds.append(usd)
+    return timestamps, values, usds
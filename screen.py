@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+""" screen.py - rewrite only the lines of the terminal that changed
+    v0.0.1 - 2026-10-19 - nelbren@nelbren.com"""
+import sys
+from io import StringIO
+from rich.console import Console
+
+HOME = "\x1b[H"
+CLEAR = "\x1b[2J"
+CLEAR_LINE = "\x1b[2K"
+CLEAR_DOWN = "\x1b[J"
+
+
+class Screen:
+    """Terminal that keeps the previous frame, the frames are rendered
+    off-screen (without recording) and only the changed lines are sent"""
+
+    def __init__(self, file=None):
+        self.file = file or sys.stdout
+        self.color_system = Console(file=self.file).color_system
+        self.lines = None
+
+    def console(self, size_term):
+        """Off-screen console for the next frame"""
+        return Console(
+            file=StringIO(),
+            width=size_term["columns"],
+            height=size_term["lines"],
+            force_terminal=True,
+            color_system=self.color_system,
+        )
+
+    def reset(self):
+        """Draw the next frame from scratch (after a resize)"""
+        self.lines = None
+
+    def update(self, console, size_term):
+        """Show the frame of the console, returns the lines rewritten"""
+        lines = console.file.getvalue().rstrip("\n").split("\n")
+        # Like scrolling: the bottom of the frame, a line for the progress
+        # bar and another for its last new line (no scroll, rows stay put)
+        lines = lines[-(size_term["lines"] - 2) :]
+        output, changed = [], 0
+        if self.lines is None:
+            output.append(HOME + CLEAR)
+            previous = []
+        else:
+            previous = self.lines
+        for row, line in enumerate(lines):
+            if row >= len(previous) or previous[row] != line:
+                output.append(f"\x1b[{row + 1};1H{CLEAR_LINE}{line}")
+                changed += 1
+        output.append(f"\x1b[{len(lines) + 1};1H")
+        if len(lines) < len(previous):
+            output.append(CLEAR_DOWN)
+        self.file.write("".join(output))
+        self.file.flush()
+        self.lines = lines
+        return changed
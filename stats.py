@@ -0,0 +1,134 @@
+#!/usr/bin/python3
+""" stats.py - running statistics of each source, goal ETA and earnings
+    v0.0.2 - 2026-10-19 - nelbren@nelbren.com
+
+    Each new unpaid updates the mean and the co-moments of value and usd
+    against the time (the slope is the earning rate) and the mean and the
+    variance of the rate of each change, a payout starts them again. The
+    renders read a single row."""
+from math import sqrt
+from datetime import datetime, timedelta
+from database import db, Unpaid, Stat
+
+TS_FMT = "%Y-%m-%d %H:%M:%S"
+FIELDS = [
+    "count",
+    "mean_hours",
+    "mean_value",
+    "mean_usd",
+    "m2_hours",
+    "c_value",
+    "c_usd",
+    "rate_count",
+    "rate_mean",
+    "rate_m2",
+]
+LONGEST = 24 * 365 * 10  # Hours, farther ETAs are not shown
+
+
+def get_hours(newer, older):
+    """Hours between two timestamps"""
+    newer = datetime.strptime(newer, TS_FMT)
+    older = datetime.strptime(older, TS_FMT)
+    return (newer - older).total_seconds() / 3600
+
+
+def start(stat, unpaid):
+    """Start the statistics of a payout"""
+    stat.since = unpaid.timestamp
+    for field in FIELDS:
+        setattr(stat, field, 0)
+
+
+def add(stat, unpaid):
+    """Add an unpaid to the statistics (floats, they are estimates)"""
+    value, usd = float(unpaid.value), float(unpaid.usd)
+    hours = get_hours(unpaid.timestamp, stat.since)
+    stat.count += 1
+    d_hours = hours - stat.mean_hours
+    stat.mean_hours += d_hours / stat.count
+    stat.mean_value += (value - stat.mean_value) / stat.count
+    stat.mean_usd += (usd - stat.mean_usd) / stat.count
+    stat.m2_hours += d_hours * (hours - stat.mean_hours)
+    stat.c_value += d_hours * (value - stat.mean_value)
+    stat.c_usd += d_hours * (usd - stat.mean_usd)
+    elapsed = get_hours(unpaid.timestamp, stat.last) if stat.count > 1 else 0
+    if elapsed > 0:
+        rate = (value - stat.last_value) / elapsed
+        stat.rate_count += 1
+        d_rate = rate - stat.rate_mean
+        stat.rate_mean += d_rate / stat.rate_count
+        stat.rate_m2 += d_rate * (rate - stat.rate_mean)
+    stat.last = unpaid.timestamp
+    stat.last_value, stat.last_usd = value, usd
+
+
+def update(stat, unpaid):
+    """Add an unpaid, a lower value is a payout (start again)"""
+    if stat.count == 0 or float(unpaid.value) < stat.last_value:
+        start(stat, unpaid)
+    add(stat, unpaid)
+
+
+def save_stats(unpaid):
+    """Add a new unpaid to the statistics of its source"""
+    stat = Stat.get_or_none(
+        (Stat.source == unpaid.source) & (Stat.currency == unpaid.currency)
+    )
+    if stat is None:
+        stat = Stat(source=unpaid.source, currency=unpaid.currency, count=0)
+    update(stat, unpaid)
+    stat.save()
+
+
+def backfill_stats():
+    """Build the statistics of the unpaids (old databases)"""
+    if Stat.select().exists() or not Unpaid.select().exists():
+        return
+    stats = {}
+    unpaids = Unpaid.select().order_by(
+        Unpaid.source, Unpaid.currency, Unpaid.work, Unpaid.step
+    )
+    for unpaid in unpaids.iterator():
+        key = (unpaid.source, unpaid.currency)
+        if key not in stats:
+            stats[key] = Stat(source=key[0], currency=key[1], count=0)
+        update(stats[key], unpaid)
+    with db.atomic():
+        for stat in stats.values():
+            stat.save()
+
+
+def get_stat(source, currency):
+    """Statistics of the source, None without data"""
+    return Stat.get_or_none(
+        (Stat.source == source) & (Stat.currency == currency)
+    )
+
+
+def get_slope(stat, field):
+    """Earning rate by hour (value or usd), None without enough data"""
+    if stat is None or stat.m2_hours <= 0:
+        return None
+    return getattr(stat, f"c_{field}") / stat.m2_hours
+
+
+def get_stdev(stat):
+    """Deviation of the rate (value by hour) of the changes"""
+    if stat is None or stat.rate_count < 2:
+        return None
+    return sqrt(stat.rate_m2 / (stat.rate_count - 1))
+
+
+def get_eta(stat, field, goal):
+    """When the goal (value or usd) is reached at the earning rate"""
+    slope = get_slope(stat, field)
+    if not goal or slope is None:
+        return None
+    missing = float(goal) - getattr(stat, f"last_{field}")
+    last = datetime.strptime(stat.last, TS_FMT)
+    if missing <= 0:
+        return last
+    if slope <= 0 or missing / slope > LONGEST:
+        return None
+    return last + timedelta(hours=missing / slope)
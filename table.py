@@ -1,8 +1,12 @@
 #!/usr/bin/python3
 """ table.py - manage table
-    v0.0.4 - 2022-05-18 - nelbren@nelbren.com"""
+    v0.0.6 - 2026-10-19 - nelbren@nelbren.com"""
 import os
+import sys
 import time
+import select
+import signal
+from contextlib import contextmanager
 from rich import box
 from rich.table import Table
 from rich.progress import (
@@ -13,6 +17,8 @@ from rich.progress import (
     TimeRemainingColumn,
 )
 
+REFRESH = 5  # Seconds between the redraws of the progress bar
+
 
 def get_columns_and_lines(params):
     """Get size of terminal"""
@@ -59,39 +65,21 @@ def make_table():
     return table
 
 
-def add_row_date(table, delta):
+def add_row_date(table, summary):
     """Row date"""
     cols = [7, 11, 11, 8, 7, 6]
     label = "─"
     color1 = "[black on white]"
     color2 = "[white on black]"
-    if delta["~count"]:
-        delta["~value"] /= delta["~count"]
-    delta["±usd_diff"] = delta["usd_diff"] - delta["last_usd_diff"]
     table.add_row(
-        f"{color1}{delta['date']}",
+        f"{color1}{summary['date']}",
         f"{color2}{cols[0] * label}",
-        f"{color1}{delta['btc_diff']:01.8f}",
-        f"{color1}~{delta['~value']:01.8f}",
+        f"{color1}{summary['btc_diff']:01.8f}",
+        f"{color1}~{summary['~value']:01.8f}",
         f"{color2}{cols[3] * label}",
-        f"{color1}{delta['usd_diff']:05.2f}",
-        f"{color2}{delta['±usd_diff']:05.2f}",
+        f"{color1}{summary['usd_diff']:05.2f}",
+        f"{color2}{summary['±usd_diff']:05.2f}",
     )
-    delta["last_usd_diff"] = delta["usd_diff"]
-
-
-def set_and_and_row_date(table, last_unpaid, unpaid, delta):
-    """Set and add date"""
-    delta["±usd_sum"] = 0
-    if last_unpaid is None:
-        delta["btc_first"], delta["usd_first"] = unpaid.value, unpaid.usd
-    else:
-        delta["btc_first"], delta["usd_first"] = (
-            last_unpaid.value,
-            last_unpaid.usd,
-        )
-    add_row_date(table, delta)
-    delta["~count"] = 0
 
 
 def add_row(table, tag, delta, unpaid):
@@ -107,17 +95,52 @@ def add_row(table, tag, delta, unpaid):
     )
 
 
-def add_last_row(table, delta, last_unpaid):
-    """Add last summary"""
-    delta["date"] = ""
-    delta["btc_diff"] = last_unpaid.value - delta["btc_first"]
-    delta["usd_diff"] = last_unpaid.usd - delta["usd_first"]
-    delta["~count"] += 1
-    add_row_date(table, delta)
-
+@contextmanager
+def wakeups():
+    """Wait function that wakes up on a resize (SIGWINCH) or a keypress"""
+    reader, writer = os.pipe()
+    os.set_blocking(writer, False)
+    sigwinch = getattr(signal, "SIGWINCH", None)
+    if sigwinch:
+        handler = signal.signal(
+            sigwinch, lambda *_: os.write(writer, b"\0")
+        )
+    keys = sys.stdin.isatty()
+    if keys:
+        # pylint: disable=import-outside-toplevel
+        import termios
+        import tty
+
+        attrs = termios.tcgetattr(sys.stdin)
+        tty.setcbreak(sys.stdin)  # One key is enough, Ctrl-C still works
+
+    def wait(timeout):
+        readers = [reader] + ([sys.stdin] if keys else [])
+        ready, _, _ = select.select(readers, [], [], timeout)
+        if reader in ready:
+            os.read(reader, 512)
+            return "resize"
+        if keys and sys.stdin in ready:
+            os.read(sys.stdin.fileno(), 32)
+            return "key"
+        return None
 
-def show_progress(seconds, next_update):
-    """Show the progress bar"""
+    try:
+        yield wait
+    finally:
+        if keys:
+            termios.tcsetattr(sys.stdin, termios.TCSADRAIN, attrs)
+        if sigwinch:
+            signal.signal(sigwinch, handler)
+        os.close(reader)
+        os.close(writer)
+
+
+def show_progress(seconds, next_update, refresh=REFRESH, changed=None):
+    """Show the progress bar until the update, only redrawn each refresh
+    seconds, wakes up early on a resize, a keypress or new data (changed)
+    and returns the reason: update, resize, key or data"""
+    end = time.monotonic() + seconds
     with Progress(
         TextColumn(
             f"[magenta on black]Waiting "
@@ -128,9 +151,17 @@ def show_progress(seconds, next_update):
         "[progress.percentage]{task.percentage:>3.1f}%",
         SpinnerColumn(),
         TimeRemainingColumn(),
+        auto_refresh=False,
         expand=True,
-    ) as progress:
-        task1 = progress.add_task("waiting 4 hours", total=seconds)
-        while not progress.finished:
-            progress.update(task1, advance=1)
-            time.sleep(1)
+    ) as progress, wakeups() as wait:
+        task1 = progress.add_task("waiting", total=seconds)
+        while True:
+            left = end - time.monotonic()
+            progress.update(task1, completed=seconds - left, refresh=True)
+            if left <= 0:
+                return "update"
+            reason = wait(min(refresh, left))
+            if reason:
+                return reason
+            if changed and changed():
+                return "data"
@@ -0,0 +1,68 @@
+""" test_archive.py - reads of the parquet archive
+    v0.0.1 - 2026-10-19 - nelbren@nelbren.com"""
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import archive  # pylint: disable=wrong-import-position
+
+pytestmark = pytest.mark.skipif(archive.pa is None, reason="no pyarrow")
+ROWS = {
+    # source, month: (id, timestamp)
+    ("nicehash", "2026-08"): [(1, "2026-08-10 00:00:00")],
+    ("nicehash", "2026-09"): [
+        (2, "2026-09-10 00:00:00"),
+        (3, "2026-09-20 00:00:00"),
+    ],
+    ("ethermine", "2026-08"): [(4, "2026-08-15 00:00:00")],
+}
+
+
+@pytest.fixture(name="base")
+def fixture_base(tmp_path, monkeypatch):
+    """Archive with the rows in a temporary directory"""
+    monkeypatch.setattr(archive, "BASE", str(tmp_path))
+    for (source, month), rows in ROWS.items():
+        archive.write_partition(
+            source,
+            month,
+            [(id_, "btc", 1, id_, ts, 1.0, 1.0, 0.0, 0.0) for id_, ts in rows],
+        )
+    return tmp_path
+
+
+def get_ids(table):
+    """Ids of the rows loaded"""
+    return sorted(table.column("id").to_pylist())
+
+
+@pytest.mark.usefixtures("base")
+def test_read_all():
+    assert get_ids(archive.read(["id"])) == [1, 2, 3, 4]
+
+
+@pytest.mark.usefixtures("base")
+def test_read_after_loads_only_the_newer_rows():
+    table = archive.read(
+        ["id", "source"], after={"nicehash": "2026-09-10 00:00:00"}
+    )
+    # Up to the timestamp of nicehash, not loaded, ethermine is new
+    assert get_ids(table) == [3, 4]
+    table = archive.read(
+        ["id"],
+        after={
+            "nicehash": "2026-09-20 00:00:00",
+            "ethermine": "2026-08-15 00:00:00",
+        },
+    )
+    assert table.num_rows == 0
+
+
+def test_read_after_skips_the_older_months(base):
+    # The file of a month before the timestamp isn't opened
+    old = base / "source=nicehash" / "month=2026-08" / "data.parquet"
+    old.write_bytes(b"not parquet")
+    table = archive.read(["id"], after={"nicehash": "2026-09-10 00:00:00"})
+    assert get_ids(table) == [3, 4]
@@ -0,0 +1,29 @@
+""" test_preview.py - options of preview.py
+    v0.0.1 - 2026-10-19 - nelbren@nelbren.com"""
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import preview  # pylint: disable=wrong-import-position
+
+
+def get_params(monkeypatch, *args):
+    """Params of the command line, without a config file"""
+    monkeypatch.setattr(sys, "argv", ["preview.py", "-n", *args])
+    monkeypatch.setattr(preview, "get_config", lambda: {"hostname": None})
+    return preview.get_params()
+
+
+@pytest.mark.parametrize("buckets", ["0", "-3", "x"])
+def test_buckets_below_one_is_a_usage_error(monkeypatch, capsys, buckets):
+    with pytest.raises(SystemExit) as error:
+        get_params(monkeypatch, "--buckets", buckets)
+    assert error.value.code == 2
+    assert "--buckets" in capsys.readouterr().err
+
+
+def test_buckets(monkeypatch):
+    assert get_params(monkeypatch)["buckets"] == 42
+    assert get_params(monkeypatch, "--buckets", "1")["buckets"] == 1
@@ -0,0 +1,81 @@
+#!/usr/bin/python3
+""" timing.py - named spans around the stages of a refresh
+    v0.0.1 - 2026-10-19 - nelbren@nelbren.com
+
+    With --profile each span writes a JSON line with its duration and
+    the requests sent to the pools while it was open, --profile-stage
+    attaches the cProfile of one stage (a .prof file for each span)."""
+import sys
+import json
+import time
+import cProfile
+import threading
+from datetime import datetime
+from contextlib import contextmanager
+
+TS_FMT = "%Y-%m-%d %H:%M:%S"
+STATE = {"file": None, "path": None, "stage": None, "profiles": 0}
+LOCK = threading.Lock()
+
+
+def setup(path, stage=None):
+    """Write the spans to the path (- for stderr)"""
+    if path == "-":
+        STATE["file"] = sys.stderr
+    else:
+        # pylint: disable=consider-using-with
+        STATE["file"] = open(path, "a", encoding="utf-8", buffering=1)
+    STATE["path"] = "profile" if path == "-" else path
+    STATE["stage"] = stage
+
+
+def get_requests():
+    """Requests sent to the pools"""
+    # pylint: disable=import-outside-toplevel
+    from mining.resilience import COUNTS
+
+    return sum(COUNTS.values())
+
+
+def write(record):
+    """Write a JSON line"""
+    with LOCK:
+        STATE["file"].write(json.dumps(record) + "\n")
+
+
+def get_profile(stage):
+    """Profiler of the span, only for the stage chosen"""
+    if STATE["stage"] != stage:
+        return None
+    with LOCK:
+        STATE["profiles"] += 1
+        number = STATE["profiles"]
+    return cProfile.Profile(), f"{STATE['path']}.{stage}.{number}.prof"
+
+
+@contextmanager
+def span(stage, **fields):
+    """Time the stage (nothing without setup)"""
+    if STATE["file"] is None:
+        yield
+        return
+    record = {"ts": datetime.now().strftime(TS_FMT), "stage": stage}
+    record.update(fields)
+    profile = get_profile(stage)
+    requests = get_requests()
+    start = time.perf_counter()
+    if profile:
+        profile[0].enable()
+    try:
+        yield
+    except BaseException as exception:
+        record["error"] = type(exception).__name__
+        raise
+    finally:
+        if profile:
+            profile[0].disable()
+            profile[0].dump_stats(profile[1])
+            record["cprofile"] = profile[1]
+        record["ms"] = round((time.perf_counter() - start) * 1000, 3)
+        record["requests"] = get_requests() - requests
+        write(record)
@@ -0,0 +1,44 @@
+#!/usr/bin/python3
+""" units.py - exact amounts of the wallets
+    v0.0.2 - 2026-10-19 - nelbren@nelbren.com
+
+    The amounts are Decimal in memory and integers of base units in the
+    database: nano coins for the values (a satoshi is 10 of them, wei
+    don't fit in 64 bits), cents for the usd and ten-thousandths of a
+    dollar for the prices of a coin. Floats only at the edges
+    (charts, json, statistics)."""
+from decimal import Decimal, ROUND_HALF_EVEN
+
+VALUE_PLACES = 9
+USD_PLACES = 2
+PRICE_PLACES = 4
+WEI_PLACES = 18
+
+
+def to_decimal(amount):
+    """Exact amount of a number or a text, a float by its shortest text"""
+    if isinstance(amount, float):
+        amount = repr(amount)
+    return Decimal(amount)
+
+
+def to_units(amount, places):
+    """Integer of base units of the amount (rounded half even)"""
+    unit = Decimal(1).scaleb(-places)
+    quantized = to_decimal(amount).quantize(unit, rounding=ROUND_HALF_EVEN)
+    return int(quantized.scaleb(places))
+
+
+def from_units(units, places):
+    """Amount of an integer of base units"""
+    return Decimal(int(units)).scaleb(-places)
+
+
+def round_units(amount, places):
+    """Amount rounded to the base units"""
+    return from_units(to_units(amount, places), places)
+
+
+def get_usd(value, price):
+    """Usd of the value at the price, in cents"""
+    return round_units(to_decimal(value) * to_decimal(price), USD_PLACES)
@@ -0,0 +1,395 @@
+#!/usr/bin/python3
+""" view.py - show the data (big numbers, charts and tables)
+    v0.0.7 - 2026-10-19 - nelbren@nelbren.com"""
+import sys
+from datetime import datetime
+import peewee
+from peewee import fn
+from database import Unpaid
+from deltas_and_tags import (
+    tags_row,
+    tags_title,
+    get_goal_msg,
+    get_summary_empty,
+    get_last_summary,
+    next_deltas,
+    load_deltas,
+    query_unpaids,
+    has_deltas,
+)
+from table import (
+    get_columns_and_lines,
+    make_table,
+    add_row_date,
+    add_row,
+    show_progress,
+)
+import big_text
+import notify
+import fetch
+import chart_text
+from screen import Screen
+from render_session import RenderSession
+from timing import span
+
+TS_FMT = "%Y-%m-%d %H:%M:%S"
+next_update = {}
+
+
+def get_records(records, source, currency):
+    """Get records and recalculate number of records"""
+    try:
+        if records == 0:
+            unpaids = query_unpaids(source, currency).order_by(
+                Unpaid.work.desc(), Unpaid.step.desc()
+            )
+        else:
+            unpaids = (
+                query_unpaids(source, currency)
+                .order_by(Unpaid.work.desc(), Unpaid.step.desc())
+                .limit(records)
+            )
+            last_unpaid = unpaids[-1]
+            count, item = records - 1, 0
+            for unpaid in unpaids:  # reversed(unpaids):
+                count -= 1
+                if count <= 0:
+                    break
+                if unpaid.timestamp[:10] != last_unpaid.timestamp[:10]:
+                    last_unpaid = unpaid
+                    item += 1
+
+            item += 1  # First and Last
+            records -= item  # Extra line of summary
+            unpaids = (
+                query_unpaids(source, currency)
+                .order_by(Unpaid.work.desc(), Unpaid.step.desc())
+                .limit(records)
+            )
+
+    except peewee.DoesNotExist:
+        print("do-something")
+    return records, unpaids
+
+
+def set_missing(params):
+    """Set Missing"""
+    timestamp = datetime.now().strftime(TS_FMT)
+    timestamp_obj = datetime.strptime(timestamp, TS_FMT)
+    if timestamp_obj > next_update["timestamp"]:
+        set_next_update(params)
+    next_update["missing"] = next_update["timestamp"] - timestamp_obj
+    next_update["total_seconds"] = next_update["missing"].total_seconds()
+
+
+def set_next_update(params):
+    """Set Next Update, learned from the cadence of the sources"""
+    next_update["timestamp"] = fetch.next_poll(params)
+    next_update["change"] = fetch.next_change(params)
+
+
+def iterate_on_records(source, currency, table, params, data):
+    """Iterate on records"""
+
+    tag = {}
+    tag["currency"] = "[cyan]"
+    with span("db.read", source=source):
+        params[f"records_{source}"], unpaids = get_records(
+            params[f"records_{source}"], source, currency
+        )
+        unpaids = list(unpaids)
+    data["last_unpaid"] = None
+    delta = {}
+
+    item = 0
+    for unpaid in reversed(unpaids):
+        item += 1
+        last_delta = delta
+        if has_deltas(unpaid):
+            delta, summary = load_deltas(unpaid, unpaid.delta)
+        else:
+            delta, summary = next_deltas(
+                data["last_unpaid"], unpaid, last_delta
+            )
+        if data["last_unpaid"] is None:
+            last_delta = delta
+        tags_row(tag, data["last_unpaid"], unpaid, last_delta, delta)
+        if summary is None and item == 1:
+            summary = get_summary_empty(delta)
+        if summary is not None:
+            add_row_date(table, summary)
+            data["lines_show"] -= 1
+        add_row(table, tag, delta, unpaid)
+        data["lines_show"] -= 1
+        data["last_unpaid"] = unpaid
+    if data["last_unpaid"] is not None:
+        set_next_update(params)
+
+    add_row_date(table, get_last_summary(delta, data["last_unpaid"]))
+    data["lines_show"] -= 4  # 1 Summary + 3 Header
+
+
+def show_data(session, params, unpaid_save, size_term):
+    """Show time"""
+    console = session.console
+    if params["records"] == -1:
+        params["records"] = size_term["lines"]
+        if params["ethermine"] and params["cryptoatcost"]:
+            params["records"] = int(params["records"] / 2)  # Sharing
+        params["records"] -= 4  # 3 Lines of header + 1 of Footer
+    sources = []
+    if params["ethermine"]:
+        sources.append("ethermine")
+        params["records_ethermine"] = params["records"]
+    if params["cryptoatcost"]:
+        sources.append("cryptoatcost")
+        params["records_cryptoatcost"] = params["records"]
+    if params["nicehash"]:
+        sources.append("nicehash")
+        params["records_nicehash"] = params["records"]
+
+    lines_show = size_term["lines"] - 1
+    if lines_show < 3 and params["records"]:
+        print("Too small to show")
+        sys.exit(0)
+    if console.file is sys.stdout:  # Not off-screen
+        print(chr(27) + "[2J")
+
+    data = {
+        "lines_show": lines_show,
+        "next_update": next_update,
+        "last_unpaid": None,
+        "unpaid_save": unpaid_save,
+    }
+    tag = {}
+    for source in sources:
+        if source == "cryptoatcost":
+            currency = "btc"
+        elif source == "nicehash":
+            currency = "btc"
+        else:
+            currency = "eth"
+        with span("render.table", source=source):
+            table = make_table()
+            iterate_on_records(source, currency, table, params, data)
+        timestamp = datetime.now().strftime(TS_FMT)
+        tags_title(tag, data["last_unpaid"], timestamp)
+        size_term = get_columns_and_lines(params)
+        msg = get_goal_msg(
+            source, currency, tag, data["last_unpaid"], size_term
+        )
+        console.print(
+            f"{tag['title']} ⛏️ {currency.upper()}@"
+            f"[bold white]{timestamp}[not bold black] "
+            f"{tag['ok']}{msg}",
+            style=tag["style"],
+            justify="center",
+        )
+        with span("render.print", source=source):
+            console.print(table)
+    if params["records"] != 0:
+        while data["lines_show"] > 0:
+            data["lines_show"] -= 1
+            console.print("")
+    with span("export"):
+        image = session.export(params)
+    if "timestamp" not in next_update:
+        print("Nothing to do.")
+        sys.exit(0)
+    set_missing(params)
+    return next_update["total_seconds"], tag, image
+
+
+def show_big(params, size_term, console=None):
+    """Show big"""
+    datas = []
+    if params["ethermine"]:
+        datas.append(
+            {"source": "ethermine", "currency": "eth", "color": "white"}
+        )
+    if params["cryptoatcost"]:
+        datas.append(
+            {"source": "cryptoatcost", "currency": "btc", "color": "white"}
+        )
+    if params["nicehash"]:
+        datas.append(
+            {"source": "nicehash", "currency": "btc", "color": "white"}
+        )
+    for data in datas:
+        source = data["source"]
+        currency = data["currency"]
+        with span("db.read", source=source):
+            unpaids = list(
+                Unpaid.select()
+                .where(
+                    (Unpaid.source == source) & (Unpaid.currency == currency)
+                )
+                .order_by(Unpaid.work.desc(), Unpaid.step.desc())
+                .limit(2)
+            )
+        if len(unpaids) >= 1:
+            data["usd_" + source] = unpaids[0].usd
+            data["val_" + source] = unpaids[0].value
+        if len(unpaids) == 2:
+            if unpaids[0].usd == unpaids[1].usd:
+                data["tag_usd"] = "="
+                data["color_usd"] = "white"
+            elif unpaids[0].usd > unpaids[1].usd:
+                data["tag_usd"] = "^"
+                data["color_usd"] = "green"
+            else:
+                data["tag_usd"] = "v"
+                data["color_usd"] = "red"
+            if unpaids[0].value == unpaids[1].value:
+                data["tag_val"] = "="
+                data["color_val"] = "white"
+            elif unpaids[0].value > unpaids[1].value:
+                data["tag_val"] = "^"
+                data["color_val"] = "green"
+            else:
+                data["tag_val"] = "v"
+                data["color_val"] = "red"
+        else:
+            data["tag_usd"] =  data["tag_val"] = "="
+            data["color_usd"] = data["color_val"] = "white"
+    tags, colors, usds, vals = {}, {}, {}, {}
+    colors["normal"] = "black"
+    items = 0
+    if params["ethermine"]:
+        tags["usd_ethermine"] = datas[items]["tag_usd"]
+        tags["val_ethermine"] = datas[items]["tag_val"]
+        colors["usd_ethermine"] = datas[items]["color_usd"]
+        colors["val_ethermine"] = datas[items]["color_val"]
+        usds["usd_ethermine"] = datas[items]["usd_ethermine"]
+        vals["val_ethermine"] = datas[items]["val_ethermine"]
+        items += 1
+    if params["cryptoatcost"]:
+        tags["usd_cryptoatcost"] = datas[items]["tag_usd"]
+        tags["val_cryptoatcost"] = datas[items]["tag_val"]
+        colors["usd_cryptoatcost"] = datas[items]["color_usd"]
+        colors["val_cryptoatcost"] = datas[items]["color_val"]
+        usds["usd_cryptoatcost"] = datas[items]["usd_cryptoatcost"]
+        vals["val_cryptoatcost"] = datas[items]["val_cryptoatcost"]
+        items += 1
+    if params["nicehash"]:
+        tags["usd_nicehash"] = datas[items]["tag_usd"]
+        tags["val_nicehash"] = datas[items]["tag_val"]
+        colors["usd_nicehash"] = datas[items]["color_usd"]
+        colors["val_nicehash"] = datas[items]["color_val"]
+        usds["usd_nicehash"] = datas[items]["usd_nicehash"]
+        vals["val_nicehash"] = datas[items]["val_nicehash"]
+    # print(vals)
+    with span("render.big"):
+        console, numbers = big_text.show_big(
+            usds, vals, tags, colors, size_term, console
+        )
+    # if params["cryptoatcost"]:
+    #    big_text.show_big2(console, data["val_cryptoatcost"])
+    # if params["nicehash"]:
+    #    big_text.show_big2(console, data["val_nicehash"])
+    return console, numbers
+
+
+def show_chart(console, params, size_term):
+    """Show chart"""
+    sources = []
+    if params["ethermine"]:
+        sources.append(("ethermine", "eth"))
+    if params["cryptoatcost"]:
+        sources.append(("cryptoatcost", "btc"))
+    if params["nicehash"]:
+        sources.append(("nicehash", "btc"))
+    for source, currency in sources:
+        with span("render.chart", source=source):
+            console.print(
+                chart_text.ChartText(
+                    source,
+                    currency,
+                    size_term,
+                    params["chart"],
+                    params["buckets"],
+                )
+            )
+
+
+def render_data(params, session):
+    """Show big numbers, charts and tables"""
+    size_term = session.size_term
+    console, numbers = show_big(params, size_term, session.new_console())
+    show_chart(console, params, size_term)
+    _, tag, image = show_data(session, params, {}, size_term)
+    return numbers, tag, image, next_update
+
+
+def get_version():
+    """Version of the data (last id)"""
+    return Unpaid.select(fn.MAX(Unpaid.id)).scalar()
+
+
+def get_data(params, size_term, console=None):
+    """Get data from miner"""
+    unpaid_save = fetch.fetch_data(params)
+    console, numbers = show_big(params, size_term, console)
+    return console, numbers, unpaid_save
+
+
+def is_exported(params):
+    """The image (and the HTML) of the data are needed"""
+    return params["save_dir"] or params["mail"] or params["telegram"]
+
+
+def is_once(params):
+    """Show the data only once (no waiting for the next update)"""
+    return params["big"] or params["records"] == 0 or is_exported(params)
+
+
+def refresh(params, session, size_term, reason):
+    """Get the data (when the update is due), show it and send it"""
+    console = session.new_console(size_term)
+    if reason in ("update", "key"):  # A key asks for the data now
+        console, numbers, unpaid_save = get_data(params, size_term, console)
+    else:  # Only render again (resize or data of another process)
+        console, numbers = show_big(params, size_term, console)
+        unpaid_save = {}
+    if params["big"]:
+        return None
+    show_chart(console, params, size_term)
+    seconds, tag, image = show_data(session, params, unpaid_save, size_term)
+    futures = notify.deliver(params, numbers, tag, next_update, image)
+    return seconds, futures
+
+
+def do_loop(params):
+    """Eternal Loop 4 forever & ever"""
+    size_term = get_columns_and_lines(params)
+    records, reason = params["records"], "update"
+    # The frames of the loop are diffed, once it's printed (and recorded)
+    session = RenderSession(
+        size_term,
+        record=is_exported(params),
+        screen=None if is_once(params) else Screen(),
+    )
+    while True:
+        with span("refresh", reason=reason):
+            done = refresh(params, session, size_term, reason)
+        if done is None:
+            return
+        seconds, futures = done
+        if is_once(params):
+            notify.wait_all(futures)
+            return
+        session.screen.update(session.console, size_term)
+        version = get_version()
+        try:
+            reason = show_progress(
+                seconds,
+                next_update,
+                params["refresh"],
+                lambda last=version: get_version() != last,
+            )
+        except KeyboardInterrupt:
+            sys.exit(0)
+        if reason == "resize":
+            size_term = get_columns_and_lines(params)
+            session.screen.reset()
+        params["records"] = records